@@ -16,6 +16,33 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("discord_io")
 
+# Maximum number of messages Discord returns per history request
+HISTORY_PAGE_SIZE = 100
+
+async def _paged_history(channel, limit: int, page_size: int = HISTORY_PAGE_SIZE) -> List[Message]:
+    """
+    Fetch up to `limit` messages from a channel's history, one page at a time.
+    
+    Args:
+        channel: The channel (text or DM) to read from.
+        limit (int): Maximum number of messages to retrieve.
+        page_size (int, optional): Messages requested per API call. Defaults to HISTORY_PAGE_SIZE.
+        
+    Returns:
+        list[discord.Message]: The messages, newest first.
+    """
+    messages = []
+    before = None
+    while len(messages) < limit:
+        size = min(page_size, limit - len(messages))
+        page = [msg async for msg in channel.history(limit=size, before=before)]
+        messages.extend(page)
+        if len(page) < size:
+            # Reached the beginning of the channel, no need for another request
+            break
+        before = page[-1]
+    return messages
+
 class DiscordIOCore:
     """
     A decoupled I/O interface for a Discord bot that handles message inputs and actions,
@@ -55,6 +82,16 @@ class DiscordIOCore:
     async def on_ready(self):
         """Called when the client is done preparing the data received from Discord."""
         logger.info(f'Logged in as {self.client.user.name} ({self.client.user.id})')
+        
+        # Let the callback know the client can now be used
+        if self.event_callback:
+            ready_event = {
+                'type': 'ready',
+                'timestamp': datetime.now().isoformat(),
+                'bot_name': self.client.user.name,
+                'bot_id': str(self.client.user.id)
+            }
+            await self.event_callback(ready_event)
 
     async def on_message(self, message: Message):
         """
@@ -197,7 +234,7 @@ class DiscordIOCore:
 
     async def read_recent_messages(self, channel_id: int, limit: int = 100) -> List[Dict[str, Any]]:
         """
-        Get last N messages from channel.
+        Get last N messages from channel, fetched in pages of HISTORY_PAGE_SIZE.
         
         Args:
             channel_id (int): The ID of the channel to read messages from.
@@ -211,9 +248,6 @@ class DiscordIOCore:
             if not isinstance(channel_id, int):
                 channel_id = int(channel_id)
                 
-            if limit > 100:
-                limit = 100  # Discord API limit
-                
             # Get the channel and retrieve messages
             for _ in range(3):  # Retry 3 times
                 try:
@@ -223,7 +257,7 @@ class DiscordIOCore:
                         return []
                     
                     messages = []
-                    async for msg in channel.history(limit=limit):
+                    for msg in await _paged_history(channel, limit):
                         messages.append({
                             'content': msg.content,
                             'author_id': str(msg.author.id),
@@ -262,9 +296,6 @@ class DiscordIOCore:
             if not isinstance(user_id, int):
                 user_id = int(user_id)
                 
-            if limit > 100:
-                limit = 100  # Discord API limit
-                
             # Get the user and their DM channel
             for _ in range(3):  # Retry 3 times
                 try:
@@ -276,7 +307,7 @@ class DiscordIOCore:
                         dm_channel = await user.create_dm()
                     
                     messages = []
-                    async for msg in dm_channel.history(limit=limit):
+                    for msg in await _paged_history(dm_channel, limit):
                         messages.append({
                             'content': msg.content,
                             'author_id': str(msg.author.id),
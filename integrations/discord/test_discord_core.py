@@ -48,12 +48,15 @@ class MockDMChannel(MagicMock):
         self.recipient = user
         self.send = AsyncMock()
         self._history = []
+        self.history_calls = []
         
     def add_message(self, message):
         self._history.append(message)
 
-    async def history(self, limit=100):
-        for msg in self._history[:limit]:
+    async def history(self, limit=100, before=None):
+        self.history_calls.append(limit)
+        start = self._history.index(before) + 1 if before is not None else 0
+        for msg in self._history[start:start + limit]:
             yield msg
 
 class MockTextChannel(MagicMock):
@@ -64,12 +67,15 @@ class MockTextChannel(MagicMock):
         self.guild = guild
         self.send = AsyncMock()
         self._history = []
+        self.history_calls = []
 
     def add_message(self, message):
         self._history.append(message)
 
-    async def history(self, limit=100):
-        for msg in self._history[:limit]:
+    async def history(self, limit=100, before=None):
+        self.history_calls.append(limit)
+        start = self._history.index(before) + 1 if before is not None else 0
+        for msg in self._history[start:start + limit]:
             yield msg
 
 class MockGuild(MagicMock):
@@ -128,6 +134,19 @@ class TestInitialization(DiscordCoreTestCase):
         await self.discord_core.on_ready()
         # Just testing it doesn't raise exceptions, since it only logs
     
+    async def test_on_ready_emits_ready_event(self):
+        """Test on_ready forwards a ready event to the callback."""
+        callback = AsyncMock()
+        self.discord_core.set_event_callback(callback)
+        
+        await self.discord_core.on_ready()
+        
+        callback.assert_called_once()
+        event = callback.call_args[0][0]
+        self.assertEqual(event['type'], 'ready')
+        self.assertEqual(event['bot_name'], 'TestBot')
+        self.assertEqual(event['bot_id'], '999')
+    
     async def test_start_and_close(self):
         """Test starting and closing the bot."""
         # Test start
@@ -306,6 +325,27 @@ class TestDirectMessages(DiscordCoreTestCase):
             self.assertEqual(result[1]['content'], "DM 2")
             self.assertEqual(result[1]['author_id'], "999")
 
+    async def test_read_user_dm_history_stops_on_short_page(self):
+        """Test that DM history paging stops after a page shorter than requested."""
+        user = MockUser(id=123, name="TestUser")
+        dm_channel = MockDMChannel(user)
+        user.dm_channel = dm_channel
+        for i in range(150):
+            dm_channel.add_message(MockMessage(
+                id=3000 + i,
+                content=f"DM {i}",
+                author=user,
+                channel=dm_channel,
+                created_at=datetime(2023, 1, 1, 12, 0, 0)
+            ))
+        self.client_mock.fetch_user.return_value = user
+        
+        with patch('discord.channel.DMChannel', MockDMChannel):
+            result = await self.discord_core.read_user_dm_history(123, limit=500)
+        
+        self.assertEqual(len(result), 150)
+        self.assertEqual(dm_channel.history_calls, [100, 100])
+
 class TestChannelMessages(DiscordCoreTestCase):
     """Tests for channel message functionality."""
     
@@ -398,6 +438,30 @@ class TestChannelMessages(DiscordCoreTestCase):
                 self.assertEqual(result[1]['content'], "Message 2")
                 self.assertEqual(result[1]['author_id'], "124")
 
+    async def test_read_recent_messages_paginates(self):
+        """Test that reading more than one page of messages issues several history requests."""
+        guild = MockGuild(id=789, name="TestGuild")
+        user = MockUser(id=123, name="User1")
+        channel = MockTextChannel(id=456, name="test-channel", guild=guild)
+        for i in range(250):
+            channel.add_message(MockMessage(
+                id=2000 + i,
+                content=f"Message {i}",
+                author=user,
+                channel=channel,
+                guild=guild,
+                created_at=datetime(2023, 1, 1, 12, 0, 0)
+            ))
+        self.client_mock.fetch_channel.return_value = channel
+        
+        with patch('discord.channel.TextChannel', MockTextChannel):
+            with patch('discord.channel.DMChannel', MockDMChannel):
+                result = await self.discord_core.read_recent_messages(456, limit=220)
+        
+        self.assertEqual(len(result), 220)
+        self.assertEqual(channel.history_calls, [100, 100, 20])
+        self.assertEqual([m['message_id'] for m in result], [str(2000 + i) for i in range(220)])
+
 class TestErrorHandling(DiscordCoreTestCase):
     """Tests for error handling in DiscordIOCore."""
     
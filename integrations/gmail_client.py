@@ -3,11 +3,17 @@
 import os
 import pickle
 import base64
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from email.mime.text import MIMEText
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 import base64
 import quopri
 
@@ -34,6 +40,37 @@ ESSENTIAL_HEADERS = {
     'Reply-to'
 }
 
+# Calls per batch request. The API accepts 100, but Gmail recommends at most 50
+# to avoid rate limiting.
+BATCH_SIZE = 50
+
+# Attachments downloaded in parallel by download_attachments
+DOWNLOAD_WORKERS = 5
+
+# Messages whose attachment list is kept in memory
+ATTACHMENT_CACHE_SIZE = 1024
+
+# Retries for rate limited (429, 403 rateLimitExceeded) and 5xx responses.
+# googleapiclient applies randomized exponential backoff between attempts.
+NUM_RETRIES = 3
+# Backoff bounds (seconds) when re-sending failed items of a batch request
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 32.0
+
+def is_retryable_error(error):
+    """Whether an API error is worth retrying: rate limits and server errors."""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+    return status == 403 and 'ratelimitexceeded' in str(error).lower()
+
+def chunks(lst, n):
+    """Yield successive n-sized chunks from lst."""
+    for i in range(0, len(lst), n):
+        yield lst[i:i + n]
+
 def process_gmail_message(message):
     """
     Process a Gmail API message by:
@@ -204,7 +241,27 @@ class GmailClient:
         self.scopes = scopes or GOOGLE_SCOPES
         self.credentials_path = credentials_path
         self.token_path = token_path
-        self.service = self._authenticate()
+        self._credentials = self._authenticate()
+        # httplib2 connections are not thread-safe, so each thread gets its own service.
+        # A service keeps its authorized connection open, so calls from the same
+        # thread reuse it instead of doing a new TLS handshake.
+        self._local = threading.local()
+        # Gmail message contents never change, so a message's attachment list can be reused
+        self._attachment_index = lru_cache(maxsize=ATTACHMENT_CACHE_SIZE)(self._fetch_attachment_index)
+        # Long-lived download workers, so each keeps its thread-local service between calls
+        self._download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS,
+                                                     thread_name_prefix='gmail-download')
+
+    @property
+    def service(self):
+        """Gmail API service bound to the calling thread."""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            # Bundled discovery document, nothing to fetch or cache on disk
+            service = build('gmail', 'v1', credentials=self._credentials,
+                            static_discovery=True, cache_discovery=False)
+            self._local.service = service
+        return service
 
     def _authenticate(self):
         creds = None
@@ -228,7 +285,7 @@ class GmailClient:
             with open(self.token_path, 'wb') as token_file:
                 pickle.dump(creds, token_file)
 
-        return build('gmail', 'v1', credentials=creds)
+        return creds
 
     def send_email(self, to, subject, body, cc=None, from_name=None, from_email=None):
         """
@@ -264,7 +321,7 @@ class GmailClient:
         if from_email:
             sender_email = from_email
         else:
-            sender_info = self.service.users().getProfile(userId='me').execute()
+            sender_info = self.service.users().getProfile(userId='me').execute(num_retries=NUM_RETRIES)
             sender_email = sender_info['emailAddress']
         
         # Set the From header with display name if provided
@@ -276,6 +333,7 @@ class GmailClient:
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
         send_body = {'raw': raw_message}
 
+        # Not retried: a 5xx may come back after the message was actually sent
         sent_message = self.service.users().messages().send(
             userId='me', 
             body=send_body
@@ -298,20 +356,20 @@ class GmailClient:
             q=query,
             labelIds=label_ids,
             maxResults=max_results,
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
 
         messages = response.get('messages', [])
         results = []
 
-        # 2) For each message, call messages().get with format='metadata' to grab its Subject.
-        for msg in messages:
+        # 2) Fetch the metadata of all messages in batched requests to grab their Subject.
+        details = self._batch_get_messages(
+            [msg['id'] for msg in messages],
+            format='metadata',
+            metadataHeaders=['Subject', 'From', 'To', 'Cc']
+        )
+
+        for msg, detail in zip(messages, details):
             msg_id = msg['id']
-            detail = self.service.users().messages().get(
-                userId='me',
-                id=msg_id,
-                format='metadata',
-                metadataHeaders=['Subject', 'From', 'To', 'Cc']
-            ).execute()
 
             # Extract the relevant headers
             subject, from_addr, to_addr, cc_addr = None, None, None, None
@@ -339,6 +397,52 @@ class GmailClient:
 
         return results
 
+    def _batch_get_messages(self, message_ids, **get_kwargs):
+        """
+        Retrieve several messages using batch requests (one HTTP round-trip per BATCH_SIZE messages).
+        Items that fail with a rate limit or server error are re-sent with exponential backoff.
+        :param message_ids: List of message IDs to retrieve
+        :param get_kwargs: Extra arguments for messages().get (e.g. format='metadata')
+        :return: A list of message dicts, in the same order as message_ids
+        """
+        details = [None] * len(message_ids)
+        pending = list(enumerate(message_ids))
+        delay = RETRY_BASE_DELAY
+
+        for attempt in range(NUM_RETRIES + 1):
+            errors = []
+            retry = []
+
+            def on_response(request_id, response, exception):
+                i = int(request_id)
+                if exception is None:
+                    details[i] = response
+                elif is_retryable_error(exception) and attempt < NUM_RETRIES:
+                    retry.append((i, message_ids[i]))
+                else:
+                    errors.append(exception)
+
+            for id_chunk in chunks(pending, BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for i, msg_id in id_chunk:
+                    batch.add(
+                        self.service.users().messages().get(userId='me', id=msg_id, **get_kwargs),
+                        request_id=str(i)
+                    )
+                batch.execute()
+
+            if errors:
+                raise errors[0]
+            if not retry:
+                break
+
+            logger.warning(f"Retrying {len(retry)} rate limited message fetches in {delay:.1f}s")
+            time.sleep(delay + random.uniform(0, 0.25))
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+            pending = sorted(retry)
+
+        return details
+
     def get_email(self, message_id):
         """
         Retrieve a full email by ID (with headers, body, etc.).
@@ -349,9 +453,17 @@ class GmailClient:
             userId='me',
             id=message_id,
             format='full'
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         return message
     
+    def get_emails(self, message_ids):
+        """
+        Retrieve several full emails by ID using batch requests.
+        :param message_ids: List of message IDs to retrieve
+        :return: A list of message dicts, in the same order as message_ids
+        """
+        return self._batch_get_messages(message_ids, format='full')
+    
     def search_emails(
     self,
     sender=None,
@@ -404,10 +516,15 @@ class GmailClient:
     def list_attachments(self, message_id):
         """
         List all attachments in an email without downloading them.
+        The message is fetched once per message ID, later calls reuse its attachment list.
         
         :param message_id: The ID of the message to check for attachments
         :return: A list of dicts with attachment info (id, filename, mimeType, size)
         """
+        return [dict(att) for att in self._attachment_index(message_id)]
+
+    def _fetch_attachment_index(self, message_id):
+        """Fetch a message and collect its attachment info, see list_attachments."""
         message = self.get_email(message_id)
         attachments = []
         
@@ -431,7 +548,7 @@ class GmailClient:
         if 'parts' in payload:
             find_attachments(payload['parts'])
         
-        return attachments
+        return tuple(attachments)
 
     def download_attachment(self, message_id, attachment_id, filename, download_path):
         """
@@ -448,7 +565,7 @@ class GmailClient:
             userId='me',
             messageId=message_id,
             id=attachment_id
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         
         # Decode the attachment data
         data = attachment.get('data', '')
@@ -457,18 +574,21 @@ class GmailClient:
         # Ensure download directory exists
         os.makedirs(download_path, exist_ok=True)
         
-        # Create the full file path
-        file_path = os.path.join(download_path, filename)
-        
-        # Handle filename conflicts by adding a number suffix
+        # Handle filename conflicts by adding a number suffix. The name is claimed
+        # atomically, so parallel downloads of the same filename cannot collide.
         base_name, ext = os.path.splitext(filename)
+        file_path = os.path.join(download_path, filename)
         counter = 1
-        while os.path.exists(file_path):
-            file_path = os.path.join(download_path, f"{base_name}_{counter}{ext}")
-            counter += 1
+        while True:
+            try:
+                fd = os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o666)
+                break
+            except FileExistsError:
+                file_path = os.path.join(download_path, f"{base_name}_{counter}{ext}")
+                counter += 1
         
         # Write the file
-        with open(file_path, 'wb') as f:
+        with os.fdopen(fd, 'wb') as f:
             f.write(file_data)
         
         logger.info(f"Downloaded attachment: {file_path}")
@@ -484,21 +604,19 @@ class GmailClient:
         :return: A list of dicts with download results (filename, path, size, success)
         """
         attachments = self.list_attachments(message_id)
-        results = []
         
         # Create a lookup dict for quick access
         attachment_lookup = {att['filename']: att for att in attachments}
         
-        for filename in filenames:
+        def download_one(filename):
             if filename not in attachment_lookup:
-                results.append({
+                return {
                     'filename': filename,
                     'path': None,
                     'size': 0,
                     'success': False,
                     'error': f'Attachment not found in email'
-                })
-                continue
+                }
             
             attachment = attachment_lookup[filename]
             try:
@@ -509,32 +627,37 @@ class GmailClient:
                         filename=attachment['filename'],
                         download_path=download_path
                     )
-                    results.append({
+                    return {
                         'filename': attachment['filename'],
                         'path': file_path,
                         'size': attachment['size'],
                         'success': True
-                    })
+                    }
                 else:
                     # Inline attachments without an attachmentId (embedded in body)
-                    results.append({
+                    return {
                         'filename': attachment['filename'],
                         'path': None,
                         'size': attachment['size'],
                         'success': False,
                         'error': 'Inline attachment cannot be downloaded separately'
-                    })
+                    }
             except Exception as e:
                 logger.error(f"Failed to download attachment {attachment['filename']}: {e}")
-                results.append({
+                return {
                     'filename': attachment['filename'],
                     'path': None,
                     'size': attachment['size'],
                     'success': False,
                     'error': str(e)
-                })
+                }
         
-        return results
+        # A single attachment is fetched on the calling thread, with its existing service
+        if len(filenames) <= 1:
+            return [download_one(filename) for filename in filenames]
+        
+        # Attachments are fetched concurrently, results keep the order of filenames
+        return list(self._download_executor.map(download_one, filenames))
 
 
 if __name__ == '__main__':
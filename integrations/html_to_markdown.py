@@ -2,6 +2,7 @@
 Simple HTML to Markdown converter for fetching and converting web content.
 """
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 try:
     from markdownify import markdownify as md
@@ -16,13 +17,29 @@ except ImportError:
     HAS_BEAUTIFULSOUP = False
 
 
+
+
+def _create_session() -> requests.Session:
+    """Create a session that keeps connections open for reuse across fetches."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=1)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by converters created without a session of their own
+_session = _create_session()
+
+
 class HTMLToMarkdown:
     """Converts HTML content to Markdown format."""
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        self.session = session or _session
     
     def convert_url(self, url: str) -> str:
         """
@@ -35,7 +52,7 @@ class HTMLToMarkdown:
             Markdown content or error message
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             return self.convert_html(response.text)
         except requests.RequestException as e:
@@ -3,6 +3,7 @@ from ai_core.types import Message, MessageContent, ToolCall, ToolResult
 from ai_core.tools import Tool
 from ai_core.models import DEFAULT_MODEL_IDENTIFIER
 
+from functools import lru_cache
 from typing import Dict, List
 from obsidian.beacons import beacon_me, beacon_ai, beacon_error, beacon_tokens_prefix
 from obsidian.process_conversation import process_conversation
@@ -34,6 +35,12 @@ model = AI("haiku")
 # Define replacement functions
 remove = lambda *_: ""
 
+@lru_cache(maxsize=32)
+def _load_system_prompt(prompt_path: str, mtime_ns: int, size: int) -> str:
+    """Read a system prompt file. Keyed on mtime and size, so edited prompts are re-read."""
+    with open(prompt_path, "r", encoding="utf-8") as f:
+        return f.read()
+
 def calculate_cumulative_tokens(conversation_text: str, system_prompt: str = None) -> tuple[int, int]:
     """
     Calculate cumulative input/output tokens from conversation text.
@@ -392,11 +399,11 @@ def process_ai_block(block: str, context: Dict, option: str) -> str:
         if system_prompt is not None:
             # Load system prompt from the vault's Prompts folder
             prompt_path = os.path.join(PATHS.prompts_library, f"{system_prompt}.md")
-            if os.path.exists(prompt_path):
-                with open(prompt_path, "r", encoding="utf-8") as f:
-                    system_prompt = f.read()
-            else:
+            try:
+                prompt_stat = os.stat(prompt_path)
+            except OSError:
                 raise FileNotFoundError(f"Could not find system prompt '{system_prompt}' in {PATHS.prompts_library}")
+            system_prompt = _load_system_prompt(prompt_path, prompt_stat.st_mtime_ns, prompt_stat.st_size)
         
         ai_response = model.messages(messages, system_prompt=system_prompt, model_override=model_identifier,
                                     max_tokens=max_tokens, temperature=temperature,
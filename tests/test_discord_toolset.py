@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import toolsets.discord as discord_toolset
+from utils.json_utils import loads
+
+
+class FakeDiscordIOCore:
+    """Stands in for DiscordIOCore: reports ready as soon as the bot starts, then idles until stopped."""
+    instances = []
+
+    def __init__(self, token):
+        # Building a real client takes a moment
+        time.sleep(0.05)
+        self.token = token
+        self.event_callback = None
+        self.stop = threading.Event()
+        channel = SimpleNamespace(name="general", id=123456789012345678)
+        self.client = SimpleNamespace(
+            guilds=[SimpleNamespace(text_channels=[channel])],
+            event=lambda handler: handler
+        )
+        FakeDiscordIOCore.instances.append(self)
+
+    def set_event_callback(self, callback):
+        self.event_callback = callback
+
+    async def start_bot(self):
+        await self.event_callback({'type': 'ready'})
+        while not self.stop.is_set():
+            await asyncio.sleep(0.01)
+
+
+class TestDiscordClientStartup(unittest.TestCase):
+    def setUp(self):
+        FakeDiscordIOCore.instances = []
+        discord_toolset._reset_client_state()
+        discord_toolset._channels_cache = None
+        self.patches = [
+            patch.object(discord_toolset, 'DiscordIOCore', FakeDiscordIOCore),
+            patch.object(discord_toolset, 'DISCORD_BOT_TOKEN', 'fake-token'),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for instance in FakeDiscordIOCore.instances:
+            instance.stop.set()
+        if discord_toolset.discord_thread is not None:
+            discord_toolset.discord_thread.join(timeout=5)
+        for p in self.patches:
+            p.stop()
+        discord_toolset._reset_client_state()
+        discord_toolset._channels_cache = None
+
+    def test_first_call_on_cold_start_succeeds(self):
+        """The very first tool call waits for the new client instead of failing."""
+        result = loads(discord_toolset.list_discord_channels.tool.func())
+        self.assertEqual(result, [{"name": "general", "id": "123456789012345678"}])
+        self.assertEqual(len(FakeDiscordIOCore.instances), 1)
+
+    def test_concurrent_first_calls_start_one_client(self):
+        """Calls arriving together before the client exists share one client and thread."""
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(discord_toolset.list_discord_channels.tool.func()))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(len(FakeDiscordIOCore.instances), 1)
+        self.assertEqual(len(results), 5)
+        for result in results:
+            self.assertEqual(loads(result), [{"name": "general", "id": "123456789012345678"}])
+
+    def test_failed_initialization_fails_fast(self):
+        """When the client can't be built, tools error out without waiting for readiness."""
+        with patch.object(discord_toolset, 'DiscordIOCore', side_effect=RuntimeError("boom")):
+            start_time = time.monotonic()
+            result = loads(discord_toolset.list_discord_channels.tool.func())
+        self.assertIn("error", result)
+        self.assertLess(time.monotonic() - start_time, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
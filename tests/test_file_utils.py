@@ -0,0 +1,71 @@
+import unittest
+from pathlib import Path
+
+from toolsets.file_utils import build_exclude_index, should_exclude, validate_filepath, ensure_md_extension
+
+class TestShouldExclude(unittest.TestCase):
+    def setUp(self):
+        self.patterns = ["AI Chats", ".obsidian", "Archive/Old"]
+        self.index = build_exclude_index(self.patterns)
+
+    def test_build_exclude_index_groups_by_length(self):
+        self.assertEqual(self.index[1], frozenset({("AI Chats",), (".obsidian",)}))
+        self.assertEqual(self.index[2], frozenset({("Archive", "Old")}))
+
+    def test_single_part_pattern_matches_any_component(self):
+        self.assertTrue(should_exclude("AI Chats/chat.md", self.index))
+        self.assertTrue(should_exclude("Projects/.obsidian/config", self.index))
+        self.assertFalse(should_exclude("Projects/AI.md", self.index))
+
+    def test_multi_part_pattern_matches_consecutive_components(self):
+        self.assertTrue(should_exclude("Archive/Old/note.md", self.index))
+        self.assertTrue(should_exclude(Path("Notes/Archive/Old"), self.index))
+        self.assertFalse(should_exclude("Archive/New/Old/note.md", self.index))
+
+    def test_pre_split_parts(self):
+        self.assertTrue(should_exclude(("Notes", "AI Chats", "chat.md"), self.index))
+        self.assertTrue(should_exclude(("Archive", "Old", "note.md"), self.index))
+        self.assertFalse(should_exclude(("Archive", "New", "Old"), self.index))
+
+    def test_list_of_patterns_still_supported(self):
+        for path in ["AI Chats/chat.md", "Archive/Old/note.md", "Projects/AI.md"]:
+            self.assertEqual(
+                should_exclude(path, self.patterns),
+                should_exclude(path, self.index)
+            )
+
+class TestValidateFilepath(unittest.TestCase):
+    def test_valid_paths(self):
+        for path in ["note.md", "Projects/My Note (draft).md", "a-b_c/d.e's.md"]:
+            validate_filepath(path)
+
+    def test_rejects_traversal_and_absolute_paths(self):
+        for path in ["", "../secret.md", "a/../b.md", "/etc/passwd", "\\share\\file"]:
+            with self.assertRaises(ValueError):
+                validate_filepath(path)
+
+    def test_rejects_whitespace_and_hidden_files(self):
+        for path in ["   ", ".hidden.md"]:
+            with self.assertRaises(ValueError):
+                validate_filepath(path)
+
+    def test_rejects_reserved_windows_names(self):
+        for path in ["CON", "nul.md", "folder/com1.txt", "LPT9", "aux.tar.gz"]:
+            with self.assertRaises(ValueError):
+                validate_filepath(path)
+        validate_filepath("console.md")
+
+    def test_rejects_invalid_characters(self):
+        with self.assertRaises(ValueError) as context:
+            validate_filepath("notes/a*b?.md")
+        self.assertIn("'*'", str(context.exception))
+        self.assertIn("'?'", str(context.exception))
+        with self.assertRaises(ValueError):
+            validate_filepath("note.md\n")
+
+    def test_ensure_md_extension(self):
+        self.assertEqual(ensure_md_extension("note"), "note.md")
+        self.assertEqual(ensure_md_extension("note.md"), "note.md")
+
+if __name__ == '__main__':
+    unittest.main()
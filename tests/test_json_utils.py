@@ -0,0 +1,32 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from utils import json_utils
+
+class TestJsonUtils(unittest.TestCase):
+    def test_round_trip(self):
+        payload = {"id": "123", "content": "héllo", "tags": [1, 2.5, None, True]}
+        self.assertEqual(json_utils.loads(json_utils.dumps(payload)), payload)
+        self.assertIsInstance(json_utils.dumps(payload), str)
+
+    def test_invalid_json_raises_decode_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            json_utils.loads('["unterminated"')
+
+    def test_dumps_list_matches_dumps(self):
+        for count in (0, 1, 200, 201, 1000):
+            items = [{"id": str(i), "content": f"message {i}"} for i in range(count)]
+            self.assertEqual(json_utils.dumps_list(items), json_utils.dumps(items))
+
+    def test_stdlib_fallback(self):
+        payload = {"subject": "Réunion", "to": ["a@b.c"], "size": 12}
+        expected = '{"subject":"Réunion","to":["a@b.c"],"size":12}'
+        self.assertEqual(json_utils.dumps(payload), expected)
+        with patch.object(json_utils, "HAS_ORJSON", False), \
+             patch.object(json_utils, "json", json, create=True):
+            self.assertEqual(json_utils.dumps(payload), expected)
+            self.assertEqual(json_utils.loads(expected), payload)
+
+if __name__ == '__main__':
+    unittest.main()
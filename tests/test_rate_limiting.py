@@ -1,11 +1,20 @@
 import unittest
+import json
 import logging
+import math
+import os
+import random
+import tempfile
+import threading
 import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 import google.generativeai as genai
 
 from ai_core.client import AI
-from utils.rate_limiter import ReactiveRateLimiter
+from utils.rate_limiter import RateLimiter, ReactiveRateLimiter
 from ai_core.wrappers.google import GeminiWrapper
 from ai_core.types import Message, MessageContent
 
@@ -378,20 +387,20 @@ class TestRateLimiting(unittest.TestCase):
         )
         
         # Simulate a series of intermixed failures and successes
-        rate_limiter.record_failure()  # 0.1s
-        self.assertEqual(rate_limiter.get_current_backoff(), 0.1)
-        
-        rate_limiter.record_success()  # Should reduce to ~0.067s
-        self.assertAlmostEqual(rate_limiter.get_current_backoff(), 0.1 / 1.5, places=3)
-        
-        rate_limiter.record_failure()  # Should increase to ~0.133s
-        self.assertAlmostEqual(rate_limiter.get_current_backoff(), (0.1 / 1.5) * 2.0, places=3)
+        events = ["F", "S", "F", "S", "S", "S"]
+        trajectory = _replay_events(rate_limiter, events)
         
-        rate_limiter.record_success()  # Should reduce to ~0.089s
-        self.assertAlmostEqual(rate_limiter.get_current_backoff(), ((0.1 / 1.5) * 2.0) / 1.5, places=3)
-        
-        rate_limiter.record_success()  # Should reduce further
-        rate_limiter.record_success()  # Should reduce further
+        # 0.1 -> /1.5 -> *2.0 -> /1.5 -> /1.5 -> /1.5
+        expected = _expected_backoff_trajectory(
+            events,
+            initial_backoff=0.1,
+            backoff_factor=2.0,
+            recovery_factor=1.5,
+            max_backoff=600.0,
+            min_threshold=0.01
+        )
+        self.assertEqual(expected[:4], [0.1, 0.1 / 1.5, (0.1 / 1.5) * 2.0, ((0.1 / 1.5) * 2.0) / 1.5])
+        _assert_trajectory_close(self, trajectory, expected)
         
         # Consecutive successes should be tracked
         self.assertEqual(rate_limiter.get_status_info()['consecutive_successes'], 3)
@@ -400,5 +409,365 @@ class TestRateLimiting(unittest.TestCase):
         rate_limiter.record_failure()
         self.assertEqual(rate_limiter.get_status_info()['consecutive_successes'], 0)
 
+    def test_long_random_backoff_trajectory(self):
+        """Stress test: a long random sequence of events follows the backoff rules at every step."""
+        rng = random.Random(1234)
+        events = [rng.choice("FSS") for _ in range(10_000)]
+        
+        rate_limiter = ReactiveRateLimiter(
+            name="test_stress_limiter",
+            initial_backoff_seconds=0.1,
+            backoff_factor=2.0,
+            max_backoff_seconds=5.0,
+            recovery_factor=1.5
+        )
+        with patch.object(rate_limiter, 'logger'):
+            trajectory = _replay_events(rate_limiter, events)
+        
+        expected = _expected_backoff_trajectory(
+            events,
+            initial_backoff=0.1,
+            backoff_factor=2.0,
+            recovery_factor=1.5,
+            max_backoff=5.0,
+            min_threshold=0.01
+        )
+        _assert_trajectory_close(self, trajectory, expected)
+
+    def test_additive_recovery(self):
+        """With recovery_alpha set, each success takes a fixed amount off the backoff."""
+        rate_limiter = ReactiveRateLimiter(
+            name="test_aimd_limiter",
+            initial_backoff_seconds=1.0,
+            backoff_factor=2.0,
+            recovery_alpha=0.5
+        )
+        
+        # 1.0 -> 2.0 -> 4.0, then down 0.5 per success
+        trajectory = _replay_events(rate_limiter, "FFF" + "S" * 8)
+        _assert_trajectory_close(self, trajectory, [1.0, 2.0, 4.0, 3.5, 3.0, 2.5, 2.0, 1.5, 1.0, 0.5, 0])
+        
+        # The backoff hit zero on the 8th success, so the limiter has fully recovered
+        status = rate_limiter.get_status_info()
+        self.assertFalse(status['has_had_failures'])
+        self.assertEqual(status['retry_count'], 0)
+
+    def test_recovery_after_backoff_reaches_zero_early(self):
+        """Failures are forgotten after 3 successes even if the backoff hit zero on the first."""
+        rate_limiter = ReactiveRateLimiter(
+            name="test_early_zero_limiter",
+            initial_backoff_seconds=0.015,
+            recovery_factor=2.0
+        )
+        
+        rate_limiter.record_failure()
+        rate_limiter.record_success()  # 0.0075 is below the threshold: backoff is zero
+        self.assertEqual(rate_limiter.get_current_backoff(), 0)
+        self.assertTrue(rate_limiter.get_status_info()['has_had_failures'])
+        
+        rate_limiter.record_success()
+        rate_limiter.record_success()
+        status = rate_limiter.get_status_info()
+        self.assertFalse(status['has_had_failures'])
+        self.assertEqual(status['retry_count'], 0)
+
+    def test_wait_jitter(self):
+        """Jittered sleeps stay between half and all of the backoff; retry-after is honoured in full."""
+        rate_limiter = ReactiveRateLimiter(name="test_jitter_limiter", initial_backoff_seconds=2.0)
+        rate_limiter.record_failure()
+        
+        with patch.object(rate_limiter._cancel, 'wait', return_value=False) as mock_sleep:
+            for _ in range(50):
+                rate_limiter.wait()
+            delays = [call.args[0] for call in mock_sleep.call_args_list]
+            self.assertTrue(all(1.0 <= delay <= 2.0 for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
+            # The schedule itself is not jittered
+            self.assertEqual(rate_limiter.get_current_backoff(), 2.0)
+            
+            mock_sleep.reset_mock()
+            rate_limiter.record_response({"retry-after": "5"})
+            rate_limiter.wait()
+            mock_sleep.assert_called_once_with(5.0)
+        
+        rate_limiter = ReactiveRateLimiter(name="test_no_jitter_limiter", initial_backoff_seconds=2.0, jitter=False)
+        rate_limiter.record_failure()
+        with patch.object(rate_limiter._cancel, 'wait', return_value=False) as mock_sleep:
+            rate_limiter.wait()
+            mock_sleep.assert_called_once_with(2.0)
+
+    def test_cancel_wakes_waiting_thread(self):
+        """cancel() ends a backoff sleep early and makes wait() return False."""
+        rate_limiter = ReactiveRateLimiter(name="test_cancel_limiter", initial_backoff_seconds=60.0)
+        rate_limiter.record_failure()
+        
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(rate_limiter.wait()))
+        start_time = time.time()
+        waiter.start()
+        rate_limiter.cancel()
+        waiter.join(timeout=5)
+        
+        self.assertFalse(waiter.is_alive())
+        self.assertLess(time.time() - start_time, 5)
+        self.assertEqual(results, [False])
+        self.assertFalse(rate_limiter.wait())
+
+    def test_record_response_headers(self):
+        """Response headers set the backoff before any failure is recorded."""
+        rate_limiter = ReactiveRateLimiter(
+            name="test_headers_limiter",
+            initial_backoff_seconds=0.5,
+            max_backoff_seconds=30.0
+        )
+        
+        # Plenty of quota left: nothing changes
+        rate_limiter.record_response({"x-ratelimit-remaining-requests": "50", "x-ratelimit-limit-requests": "100"})
+        self.assertEqual(rate_limiter.get_current_backoff(), 0)
+        self.assertFalse(rate_limiter.get_status_info()['has_had_failures'])
+        
+        # Under 10% left: back off by at least the initial backoff, header names are case-insensitive
+        rate_limiter.record_response({"Anthropic-RateLimit-Requests-Remaining": "5", "Anthropic-RateLimit-Requests-Limit": "100"})
+        self.assertEqual(rate_limiter.get_current_backoff(), 0.5)
+        self.assertTrue(rate_limiter.get_status_info()['has_had_failures'])
+        
+        # retry-after wins and is capped at max_backoff_seconds
+        rate_limiter.record_response({"Retry-After": "12"})
+        self.assertEqual(rate_limiter.get_current_backoff(), 12.0)
+        rate_limiter.record_response({"retry-after": "3600"})
+        self.assertEqual(rate_limiter.get_current_backoff(), 30.0)
+        
+        # Unparseable values are ignored
+        rate_limiter.record_response({"retry-after": "soon", "x-ratelimit-remaining-tokens": "n/a"})
+        self.assertEqual(rate_limiter.get_current_backoff(), 30.0)
+        self.assertEqual(rate_limiter.get_retry_count(), 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Unit tests for RateLimiter's persisted window, night mode, scheduling and saving."""
+
+    def setUp(self):
+        # Rate limit files go to a temporary data directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paths_patch = patch('utils.rate_limiter.PATHS', SimpleNamespace(data=Path(self.temp_dir.name)))
+        self.paths_patch.start()
+        RateLimiter._registry.clear()
+        self.limiters = []
+
+    def tearDown(self):
+        for limiter in self.limiters:
+            limiter.cancel()
+            limiter.close()
+        RateLimiter._registry.clear()
+        self.paths_patch.stop()
+        self.temp_dir.cleanup()
+
+    def _limiter(self, name="test_limiter", **kwargs):
+        kwargs.setdefault("min_delay_seconds", 0)
+        kwargs.setdefault("max_delay_seconds", 0)
+        kwargs.setdefault("night_mode", False)
+        limiter = RateLimiter(name, **kwargs)
+        self.limiters.append(limiter)
+        return limiter
+
+    def _write_state(self, name, data):
+        rate_limit_dir = Path(self.temp_dir.name) / "rate_limits"
+        rate_limit_dir.mkdir(exist_ok=True)
+        path = rate_limit_dir / f"{name}_rate_limit.json"
+        path.write_text(json.dumps(data))
+        return path
+
+    def test_window_drops_operations_older_than_24_hours(self):
+        """Only operations from the last 24 hours count against max_per_day."""
+        minute = int(time.time() // 60)
+        self._write_state("test_window", {
+            "operations_count": 8,
+            "last_operation_time": None,
+            "recent_operations": [[minute - 24 * 60 - 1, 5], [minute - 10, 3]]
+        })
+        
+        limiter = self._limiter("test_window", max_per_day=3)
+        self.assertEqual(limiter.rate_limit_data["operations_count"], 3)
+        self.assertEqual(list(limiter._buckets), [[minute - 10, 3]])
+        self.assertFalse(limiter.wait())
+        
+        # Once those operations are more than 24 hours old, the limit frees up again
+        limiter._buckets[0][0] -= 24 * 60
+        self.assertTrue(limiter.wait())
+        self.assertEqual(limiter.rate_limit_data["operations_count"], 0)
+
+    def test_migrates_legacy_per_day_file(self):
+        """Files from the per-day counter keep today's count and drop older days."""
+        last_time = time.time() - 30
+        self._write_state("test_legacy_today", {
+            "date": str(date.today()), "operations_count": 4, "last_operation_time": last_time
+        })
+        self._write_state("test_legacy_old", {
+            "date": str(date.today() - timedelta(days=1)), "operations_count": 4, "last_operation_time": last_time
+        })
+        
+        today = self._limiter("test_legacy_today")
+        self.assertEqual(today.rate_limit_data["operations_count"], 4)
+        self.assertEqual(list(today._buckets), [[int(last_time // 60), 4]])
+        self.assertEqual(today.rate_limit_data["last_operation_time"], last_time)
+        
+        old = self._limiter("test_legacy_old")
+        self.assertEqual(old.rate_limit_data["operations_count"], 0)
+
+    def test_night_time_and_morning_resume(self):
+        """Night runs from 00:30 to 07:30 and the resume time lands on the right day."""
+        limiter = self._limiter()
+        self.assertFalse(limiter._is_night_time(datetime(2026, 3, 10, 0, 29)))
+        self.assertTrue(limiter._is_night_time(datetime(2026, 3, 10, 0, 30)))
+        self.assertTrue(limiter._is_night_time(datetime(2026, 3, 10, 7, 29)))
+        self.assertFalse(limiter._is_night_time(datetime(2026, 3, 10, 7, 30)))
+        
+        hour = 3600
+        with patch('utils.rate_limiter.random.randint', return_value=0):
+            # During the night: this morning
+            self.assertEqual(limiter._get_morning_resume_time(datetime(2026, 3, 10, 3, 0)), 4.5 * hour)
+            # Before midnight, across a month and a year end: the next morning
+            self.assertEqual(limiter._get_morning_resume_time(datetime(2026, 1, 31, 23, 0)), 8.5 * hour)
+            self.assertEqual(limiter._get_morning_resume_time(datetime(2026, 12, 31, 23, 0)), 8.5 * hour)
+        with patch('utils.rate_limiter.random.randint', return_value=30):
+            # 07:30 plus 30 minutes is 08:00, not minute 60
+            self.assertEqual(limiter._get_morning_resume_time(datetime(2026, 2, 28, 23, 0)), 9 * hour)
+        
+        self.assertEqual(limiter._get_night_start_time(datetime(2026, 3, 10, 23, 0)), 1.5 * hour)
+        self.assertEqual(limiter._get_night_start_time(datetime(2026, 3, 10, 0, 30)), 24 * hour)
+
+    def test_concurrent_waits_are_spaced_by_min_delay(self):
+        """Callers waiting at the same time get start slots at least min_delay apart."""
+        delay = 0.05
+        limiter = self._limiter(min_delay_seconds=delay, max_delay_seconds=delay)
+        limiter.record_success()
+        
+        starts = []
+        def worker():
+            self.assertTrue(limiter.wait())
+            starts.append(time.monotonic())
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        starts.sort()
+        self.assertEqual(len(starts), 4)
+        for earlier, later in zip(starts, starts[1:]):
+            self.assertGreaterEqual(later - earlier, delay * 0.9)
+
+    def test_cancel_wakes_waiting_thread(self):
+        """cancel() ends a wait early and makes later waits return False."""
+        limiter = self._limiter(min_delay_seconds=60, max_delay_seconds=60)
+        limiter.record_success()
+        
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limiter.wait()))
+        start_time = time.monotonic()
+        waiter.start()
+        limiter.cancel()
+        waiter.join(timeout=5)
+        
+        self.assertFalse(waiter.is_alive())
+        self.assertLess(time.monotonic() - start_time, 5)
+        self.assertEqual(results, [False])
+        self.assertFalse(limiter.wait())
+
+    def test_same_name_returns_same_instance(self):
+        """A name maps to one limiter; later constructor arguments are ignored."""
+        first = self._limiter("test_shared", min_delay_seconds=1)
+        second = self._limiter("test_shared", min_delay_seconds=9)
+        self.assertIs(first, second)
+        self.assertEqual(second.min_delay, 1)
+        self.assertIsNot(first, self._limiter("test_other"))
+
+    def test_save_replaces_file_atomically(self):
+        """Saves go through a temporary file; a failed replace keeps the old file and the operation."""
+        limiter = self._limiter("test_atomic")
+        limiter.record_success()
+        with patch('utils.rate_limiter.os.replace', wraps=os.replace) as mock_replace:
+            limiter.close()
+        mock_replace.assert_called_once_with(f"{limiter.rate_limit_file}.tmp", limiter.rate_limit_file)
+        saved = limiter.rate_limit_file.read_text()
+        self.assertEqual(json.loads(saved)["operations_count"], 1)
+        
+        limiter.record_success()
+        with patch('utils.rate_limiter.os.replace', side_effect=OSError("disk full")):
+            limiter.close()
+        self.assertEqual(limiter.rate_limit_file.read_text(), saved)
+        
+        # The operation that failed to save is written by the next save
+        limiter.record_success()
+        limiter.close()
+        self.assertEqual(json.loads(limiter.rate_limit_file.read_text())["operations_count"], 3)
+
+    def test_saves_merge_operations_from_other_processes(self):
+        """Two limiters sharing a file, as in two processes, add up rather than overwrite each other."""
+        first = self._limiter("test_merge")
+        # A second process has its own instance for the same name
+        RateLimiter._registry.clear()
+        second = self._limiter("test_merge")
+        self.assertIsNot(first, second)
+        
+        for _ in range(2):
+            first.record_success()
+        for _ in range(3):
+            second.record_success()
+        first.close()
+        second.close()
+        
+        self.assertEqual(json.loads(second.rate_limit_file.read_text())["operations_count"], 5)
+        self.assertEqual(second.rate_limit_data["operations_count"], 5)
+        self.assertTrue(Path(f"{second.rate_limit_file}.lock").exists())
+        
+        # The first limiter picks up the second one's operations on its next save
+        first.record_success()
+        first.close()
+        self.assertEqual(first.rate_limit_data["operations_count"], 6)
+
+
+def _replay_events(rate_limiter, events):
+    """Record a failure for each 'F' and a success for each 'S', returning the backoff after each one."""
+    trajectory = []
+    for event in events:
+        if event == "F":
+            rate_limiter.record_failure()
+        else:
+            rate_limiter.record_success()
+        trajectory.append(rate_limiter.get_current_backoff())
+    return trajectory
+
+
+def _expected_backoff_trajectory(events, initial_backoff, backoff_factor, recovery_factor,
+                                 max_backoff, min_threshold):
+    """Reference backoff values after each 'F' (failure) / 'S' (success) event."""
+    trajectory = []
+    backoff = 0
+    for event in events:
+        if event == "F":
+            backoff = initial_backoff if backoff == 0 else min(backoff * backoff_factor, max_backoff)
+        elif backoff > 0:
+            backoff = backoff / recovery_factor
+            if backoff < min_threshold:
+                backoff = 0
+        trajectory.append(backoff)
+    return trajectory
+
+
+def _assert_trajectory_close(test_case, actual, expected, rel_tol=1e-6):
+    """Compare two backoff trajectories in one pass, reporting the first mismatch."""
+    actual = list(actual)
+    test_case.assertEqual(len(actual), len(expected))
+    mismatch = next(
+        (i for i, (a, e) in enumerate(zip(actual, expected)) if not math.isclose(a, e, rel_tol=rel_tol)),
+        None
+    )
+    if mismatch is not None:
+        test_case.fail(
+            f"Backoff trajectory diverges at step {mismatch}: "
+            f"expected {expected[mismatch]}, got {actual[mismatch]}"
+        )
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,11 +1,12 @@
 """Toolset for interacting with Discord."""
 
 import asyncio
-import json
-from typing import List, Dict, Any
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from ai_core.tools import tool
 from integrations.discord import DiscordIOCore
 from config.secrets import DISCORD_BOT_TOKEN
+from utils.json_utils import dumps, dumps_list
 import threading
 
 # --- Discord Client Initialization ---
@@ -14,6 +15,73 @@ discord_io: DiscordIOCore = None
 discord_thread: threading.Thread = None
 event_loop = None
 
+# Set once the client has connected (on_ready/on_resumed), cleared on disconnect
+_ready_event = threading.Event()
+# Same state as _ready_event, as a plain flag for the tool fast path
+_client_ready: bool = False
+# Maximum time (seconds) to wait for the client to become ready
+_READY_TIMEOUT = 30
+# Serializes client startup, so concurrent first calls start a single client
+_init_lock = threading.Lock()
+
+# Bounds how many tool calls can be waiting on the Discord loop at once
+_MAX_CONCURRENT_CALLS = 4
+_call_slots = threading.BoundedSemaphore(_MAX_CONCURRENT_CALLS)
+# Maximum time (seconds) to wait for a free slot before giving up
+_SLOT_TIMEOUT = 5
+
+# Cached list_discord_channels output as (monotonic timestamp, JSON payload)
+_channels_cache: Optional[Tuple[float, str]] = None
+_CHANNELS_CACHE_TTL = 30
+# Gateway events that change the channel list and invalidate the cache
+_CHANNEL_EVENTS = (
+    'on_guild_channel_create',
+    'on_guild_channel_delete',
+    'on_guild_channel_update',
+    'on_guild_join',
+    'on_guild_remove',
+)
+
+def _attach_handlers(io: DiscordIOCore):
+    """Registers the readiness and cache invalidation handlers on a new client."""
+    # You might want a simple event handler here for logging or basic checks
+    async def on_discord_event(event):
+         global _client_ready
+         print(f"Discord Event Received (in toolset): {event.get('type', 'unknown')}")
+         if event.get('type') == 'ready':
+             _client_ready = True
+             _ready_event.set()
+    
+    io.set_event_callback(on_discord_event)
+    
+    # Track connection state so callers block until the gateway is back
+    async def on_disconnect():
+        global _client_ready
+        _client_ready = False
+        _ready_event.clear()
+    
+    async def on_resumed():
+        global _client_ready
+        _client_ready = True
+        _ready_event.set()
+    
+    io.client.event(on_disconnect)
+    io.client.event(on_resumed)
+    
+    async def invalidate_channels_cache(*args):
+        global _channels_cache
+        _channels_cache = None
+    
+    for event_name in _CHANNEL_EVENTS:
+        setattr(io.client, event_name, invalidate_channels_cache)
+
+def _reset_client_state():
+    """Clears readiness so the next tool call starts a fresh client."""
+    global discord_io, _client_ready
+    _client_ready = False
+    _ready_event.clear()
+    discord_io = None
+
 def initialize_discord_client():
     """Initializes and runs the Discord client in a separate thread."""
     global discord_io, discord_thread, event_loop
@@ -22,49 +90,76 @@ def initialize_discord_client():
         # Already initialized
         return
 
-    if not DISCORD_BOT_TOKEN:
-        print("Error: DISCORD_BOT_TOKEN is not set in secrets.")
-        # Optionally raise an exception or handle this case differently
-        raise ValueError("Discord Bot Token is not configured.")
+    with _init_lock:
+        if discord_io is not None:
+            # Started by a concurrent call while we waited for the lock
+            return
 
-    try:
-        # Create a new event loop for the Discord thread
-        event_loop = asyncio.new_event_loop()
-        
-        def run_discord_loop(loop):
-            asyncio.set_event_loop(loop)
-            global discord_io
-            discord_io = DiscordIOCore(token=DISCORD_BOT_TOKEN)
-            
-            # You might want a simple event handler here for logging or basic checks
-            async def on_discord_event(event):
-                 print(f"Discord Event Received (in toolset): {event.get('type', 'unknown')}")
-                 # Add more handling if needed
-            
-            discord_io.set_event_callback(on_discord_event)
+        if not DISCORD_BOT_TOKEN:
+            print("Error: DISCORD_BOT_TOKEN is not set in secrets.")
+            # Optionally raise an exception or handle this case differently
+            raise ValueError("Discord Bot Token is not configured.")
+
+        try:
+            # Create a new event loop for the Discord thread
+            event_loop = asyncio.new_event_loop()
+            # The client is built here rather than on the thread, so discord_io is
+            # set by the time this returns and a failure shows up as None right away
+            io = DiscordIOCore(token=DISCORD_BOT_TOKEN)
+            _attach_handlers(io)
             
-            try:
-                loop.run_until_complete(discord_io.start_bot())
-            except Exception as e:
-                 print(f"Error in Discord run loop: {e}")
-            finally:
-                loop.run_until_complete(loop.shutdown_asyncgens())
-                loop.close()
-                print("Discord event loop closed.")
-
-        # Start Discord client in a separate thread
-        discord_thread = threading.Thread(target=run_discord_loop, args=(event_loop,), daemon=True)
-        discord_thread.start()
-        print("Discord client thread started.")
-        # Wait briefly for the client to potentially connect (adjust time if needed)
-        # This doesn't guarantee readiness but gives it a chance.
-        # Proper readiness check would require inter-thread communication (e.g., an Event)
-        import time
-        time.sleep(5) # Adjust as necessary
+            def run_discord_loop(loop):
+                asyncio.set_event_loop(loop)
+                try:
+                    loop.run_until_complete(io.start_bot())
+                except Exception as e:
+                     print(f"Error in Discord run loop: {e}")
+                finally:
+                    loop.run_until_complete(loop.shutdown_asyncgens())
+                    loop.close()
+                    # Allow the next tool call to start a fresh client
+                    _reset_client_state()
+                    print("Discord event loop closed.")
 
-    except Exception as e:
-        print(f"Failed to initialize Discord client: {e}")
-        discord_io = None # Ensure it's None if init fails
+            # Start Discord client in a separate thread
+            discord_thread = threading.Thread(target=run_discord_loop, args=(event_loop,), daemon=True)
+            discord_io = io
+            discord_thread.start()
+            print("Discord client thread started.")
+            # Callers that need the client wait on _ready_event themselves
+
+        except Exception as e:
+            print(f"Failed to initialize Discord client: {e}")
+            discord_io = None # Ensure it's None if init fails
+
+async def start_discord_on_loop():
+    """Hosts the Discord client on the caller's running event loop.
+
+    For asyncio hosts: the async tool variants then await client coroutines
+    directly instead of hopping to the dedicated Discord thread. Synchronous
+    tools must not be called from this loop's thread once it hosts the client.
+    """
+    global discord_io, event_loop
+    
+    with _init_lock:
+        if discord_io is not None:
+            return
+
+        if not DISCORD_BOT_TOKEN:
+            print("Error: DISCORD_BOT_TOKEN is not set in secrets.")
+            raise ValueError("Discord Bot Token is not configured.")
+
+        event_loop = asyncio.get_running_loop()
+        discord_io = DiscordIOCore(token=DISCORD_BOT_TOKEN)
+        _attach_handlers(discord_io)
+    
+    def on_bot_stopped(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error in Discord run loop: {task.exception()}")
+        _reset_client_state()
+    
+    event_loop.create_task(discord_io.start_bot()).add_done_callback(on_bot_stopped)
+    print("Discord client started on host event loop.")
 
 # Call initialization when the module is loaded
 # Be cautious with top-level initializations like this, especially if the module
@@ -74,6 +169,54 @@ def initialize_discord_client():
 
 # --- Tool Definitions ---
 
+def _require_ready() -> DiscordIOCore:
+    """Return the Discord client once it is ready, initializing it on first use."""
+    if _client_ready:
+        return discord_io
+    initialize_discord_client()
+    if discord_io is None:
+        # Initialization failed (no token, or an error): nothing will ever set the event
+        raise RuntimeError("Discord client could not be initialized.")
+    if not _ready_event.wait(timeout=_READY_TIMEOUT):
+        raise RuntimeError("Discord client not ready or not initialized.")
+    return discord_io
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Returns the event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+async def _require_ready_async() -> DiscordIOCore:
+    """Async counterpart of _require_ready, hosts the client on the running loop if needed."""
+    if discord_io is None:
+        try:
+            await start_discord_on_loop()
+        except ValueError as e:
+            raise RuntimeError(str(e))
+    if not _client_ready:
+        # Ready state is a threading.Event, wait for it off the loop
+        if not await asyncio.to_thread(_ready_event.wait, _READY_TIMEOUT):
+            raise RuntimeError("Discord client not ready or not initialized.")
+    return discord_io
+
+async def run_in_discord_loop_async(call: Callable[[DiscordIOCore], Awaitable[Any]]):
+    """Helper to run async Discord functions from async tool calls.
+
+    Takes a callable building the coroutine from the ready client. Runs it directly
+    when the client is hosted on the current loop, otherwise schedules it on the
+    Discord thread and awaits the wrapped future, so many calls can be gathered.
+    """
+    client = await _require_ready_async()
+    try:
+        if event_loop is asyncio.get_running_loop():
+            return await asyncio.wait_for(call(client), timeout=30)
+        future = asyncio.run_coroutine_threadsafe(call(client), event_loop)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=30)
+    except asyncio.TimeoutError:
+        raise TimeoutError("Discord operation timed out.")
+
 def run_in_discord_loop(coro):
     """Helper to run async Discord functions from synchronous tool calls."""
     initialize_discord_client()
@@ -83,17 +226,20 @@ def run_in_discord_loop(coro):
     if not event_loop.is_running():
          raise RuntimeError("Discord event loop is not running.")
 
+    if _running_loop() is event_loop:
+        coro.close()
+        raise RuntimeError("Discord client is hosted on this event loop, use the async tool variants.")
+
     # Ensure the client is ready before proceeding
-    # This is a basic check; a more robust solution might use an asyncio.Event
-    if not discord_io.client or not discord_io.client.is_ready():
-         import time
-         print("Discord client not ready, waiting briefly...")
-         time.sleep(2) # Wait a bit more
-         if not discord_io.client or not discord_io.client.is_ready():
-              raise RuntimeError("Discord client is not ready.")
-
-    future = asyncio.run_coroutine_threadsafe(coro, event_loop)
+    if not _ready_event.wait(timeout=_READY_TIMEOUT):
+        raise RuntimeError("Discord client is not ready.")
+
+    if not _call_slots.acquire(timeout=_SLOT_TIMEOUT):
+        coro.close()
+        raise RuntimeError("Too many concurrent Discord operations, please retry later.")
+
     try:
+        future = asyncio.run_coroutine_threadsafe(coro, event_loop)
         # Increased timeout to handle potential delays
         return future.result(timeout=30)
     except asyncio.TimeoutError:
@@ -102,6 +248,18 @@ def run_in_discord_loop(coro):
         # Log or handle the exception that occurred within the coroutine
         print(f"Exception in discord coroutine: {e}")
         raise
+    finally:
+        _call_slots.release()
+
+# Fixed tool responses, serialized once at import
+_ERR_BAD_CHANNEL_ID = dumps({"error": "Invalid channel_id format. Must be an integer."})
+_ERR_BAD_USER_ID = dumps({"error": "Invalid user_id format. Must be an integer."})
+_DM_SENT = dumps({"status": "success", "message": "DM sent successfully."})
+_DM_FAILED = dumps({"status": "error", "message": "Failed to send DM."})
+
+def _error_json(message: str) -> str:
+    """Builds an error response, serializing only the message string."""
+    return '{"error":' + dumps(message) + '}'
 
 @tool(
     description="List all accessible text channels in the server(s) the bot is in. Returns a list of channel names and IDs.",
@@ -109,19 +267,29 @@ def run_in_discord_loop(coro):
 )
 def list_discord_channels() -> str:
     """Lists all accessible text channels."""
-    initialize_discord_client()
-    if not discord_io or not discord_io.client or not discord_io.client.is_ready():
-        return json.dumps({"error": "Discord client not ready or not initialized."})
+    global _channels_cache
+    try:
+        client = _require_ready()
+    except RuntimeError as e:
+        return _error_json(str(e))
+    
+    # Guild topology rarely changes, reuse the recent listing if there is one
+    now = time.monotonic()
+    if _channels_cache and now - _channels_cache[0] < _CHANNELS_CACHE_TTL:
+        return _channels_cache[1]
         
-    channels = []
     try:
-        # Access guilds directly from the client
-        for guild in discord_io.client.guilds:
-            for channel in guild.text_channels:
-                channels.append({"name": channel.name, "id": str(channel.id)})
-        return json.dumps(channels)
+        # Access guilds directly from the client. IDs stay strings: snowflakes exceed
+        # the 53-bit integer range of many JSON consumers and tools take them as str.
+        payload = dumps([
+            {"name": channel.name, "id": str(channel.id)}
+            for guild in client.client.guilds
+            for channel in guild.text_channels
+        ])
+        _channels_cache = (now, payload)
+        return payload
     except Exception as e:
-        return json.dumps({"error": f"Failed to list channels: {str(e)}"})
+        return _error_json(f"Failed to list channels: {str(e)}")
 
 @tool(
     description="Read the most recent messages from a specific Discord channel.",
@@ -132,23 +300,21 @@ def list_discord_channels() -> str:
 def read_discord_messages(channel_id: str, limit: int = 50) -> str:
     """Reads recent messages from a Discord channel."""
     try:
-        initialize_discord_client()
-        if not discord_io or not discord_io.client or not discord_io.client.is_ready():
-            return json.dumps({"error": "Discord client not ready or not initialized."})
+        client = _require_ready()
         limit = min(max(1, limit), 1000) # Clamp limit between 1 and 1000
         # Use the helper to run the async function
         messages = run_in_discord_loop(
-            discord_io.read_recent_messages(int(channel_id), limit=limit)
+            client.read_recent_messages(int(channel_id), limit=limit)
         )
-        return json.dumps(messages)
+        return dumps_list(messages)
     except ValueError:
-        return json.dumps({"error": "Invalid channel_id format. Must be an integer."})
+        return _ERR_BAD_CHANNEL_ID
     except RuntimeError as e:
-         return json.dumps({"error": str(e)})
+         return _error_json(str(e))
     except TimeoutError as e:
-         return json.dumps({"error": str(e)})
+         return _error_json(str(e))
     except Exception as e:
-        return json.dumps({"error": f"Failed to read messages: {str(e)}"})
+        return _error_json(f"Failed to read messages: {str(e)}")
 
 @tool(
     description="Send a direct message (DM) to a specific Discord user.",
@@ -159,25 +325,23 @@ def read_discord_messages(channel_id: str, limit: int = 50) -> str:
 def send_discord_dm(user_id: str, message_text: str) -> str:
     """Sends a direct message to a Discord user."""
     try:
-        initialize_discord_client()
-        if not discord_io or not discord_io.client or not discord_io.client.is_ready():
-            return json.dumps({"error": "Discord client not ready or not initialized."})
+        client = _require_ready()
         # Use the helper to run the async function
         success = run_in_discord_loop(
-            discord_io.send_dm(int(user_id), message_text)
+            client.send_dm(int(user_id), message_text)
         )
         if success:
-            return json.dumps({"status": "success", "message": "DM sent successfully."})
+            return _DM_SENT
         else:
-            return json.dumps({"status": "error", "message": "Failed to send DM."})
+            return _DM_FAILED
     except ValueError:
-        return json.dumps({"error": "Invalid user_id format. Must be an integer."})
+        return _ERR_BAD_USER_ID
     except RuntimeError as e:
-         return json.dumps({"error": str(e)})
+         return _error_json(str(e))
     except TimeoutError as e:
-         return json.dumps({"error": str(e)})
+         return _error_json(str(e))
     except Exception as e:
-        return json.dumps({"error": f"Failed to send DM: {str(e)}"})
+        return _error_json(f"Failed to send DM: {str(e)}")
 
 @tool(
     description="Read the most recent direct messages (DMs) from a specific user.",
@@ -188,23 +352,81 @@ def send_discord_dm(user_id: str, message_text: str) -> str:
 def read_discord_dm_history(user_id: str, limit: int = 50) -> str:
     """Reads recent DMs from a specific user."""
     try:
-        initialize_discord_client()
-        if not discord_io or not discord_io.client or not discord_io.client.is_ready():
-            return json.dumps({"error": "Discord client not ready or not initialized."})
+        client = _require_ready()
         limit = min(max(1, limit), 1000) # Clamp limit between 1 and 1000
         # Use the helper to run the async function
         messages = run_in_discord_loop(
-            discord_io.read_user_dm_history(int(user_id), limit=limit)
+            client.read_user_dm_history(int(user_id), limit=limit)
         )
-        return json.dumps(messages)
+        return dumps_list(messages)
     except ValueError:
-        return json.dumps({"error": "Invalid user_id format. Must be an integer."})
+        return _ERR_BAD_USER_ID
     except RuntimeError as e:
-         return json.dumps({"error": str(e)})
+         return _error_json(str(e))
     except TimeoutError as e:
-         return json.dumps({"error": str(e)})
+         return _error_json(str(e))
+    except Exception as e:
+        return _error_json(f"Failed to read DM history: {str(e)}")
+
+# --- Async variants ---
+# The tool dispatcher calls tools synchronously, so these are not part of TOOLS.
+# Asyncio hosts can await them; the first call hosts the client on the running loop.
+
+async def list_discord_channels_async() -> str:
+    """Async variant of list_discord_channels"""
+    try:
+        await _require_ready_async()
+    except RuntimeError as e:
+        return _error_json(str(e))
+    # Reads the client's guild cache only, no loop round-trip needed
+    return list_discord_channels.tool.func()
+
+async def read_discord_messages_async(channel_id: str, limit: int = 50) -> str:
+    """Async variant of read_discord_messages"""
+    try:
+        channel = int(channel_id)
+        limit = min(max(1, limit), 1000) # Clamp limit between 1 and 1000
+        messages = await run_in_discord_loop_async(
+            lambda io: io.read_recent_messages(channel, limit=limit)
+        )
+        return dumps_list(messages)
+    except ValueError:
+        return _ERR_BAD_CHANNEL_ID
+    except (RuntimeError, TimeoutError) as e:
+        return _error_json(str(e))
+    except Exception as e:
+        return _error_json(f"Failed to read messages: {str(e)}")
+
+async def send_discord_dm_async(user_id: str, message_text: str) -> str:
+    """Async variant of send_discord_dm"""
+    try:
+        user = int(user_id)
+        success = await run_in_discord_loop_async(
+            lambda io: io.send_dm(user, message_text)
+        )
+        return _DM_SENT if success else _DM_FAILED
+    except ValueError:
+        return _ERR_BAD_USER_ID
+    except (RuntimeError, TimeoutError) as e:
+        return _error_json(str(e))
+    except Exception as e:
+        return _error_json(f"Failed to send DM: {str(e)}")
+
+async def read_discord_dm_history_async(user_id: str, limit: int = 50) -> str:
+    """Async variant of read_discord_dm_history"""
+    try:
+        user = int(user_id)
+        limit = min(max(1, limit), 1000) # Clamp limit between 1 and 1000
+        messages = await run_in_discord_loop_async(
+            lambda io: io.read_user_dm_history(user, limit=limit)
+        )
+        return dumps_list(messages)
+    except ValueError:
+        return _ERR_BAD_USER_ID
+    except (RuntimeError, TimeoutError) as e:
+        return _error_json(str(e))
     except Exception as e:
-        return json.dumps({"error": f"Failed to read DM history: {str(e)}"})
+        return _error_json(f"Failed to read DM history: {str(e)}")
 
 # Export the tools
 TOOLS = [
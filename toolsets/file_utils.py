@@ -1,54 +1,84 @@
-import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, FrozenSet, List, Tuple, Union
 
-def should_exclude(path: Union[str, Path], exclude_patterns: List[str]) -> bool:
+ExcludeIndex = Dict[int, FrozenSet[Tuple[str, ...]]]
+
+# Characters allowed in a filepath
+_SAFE_PATH_RE = re.compile(r"[A-Za-z0-9\-_./'() ]*")
+_INVALID_PATH_CHARS_RE = re.compile(r"[^A-Za-z0-9\-_./'() ]")
+
+# Reserved Windows device names
+WINDOWS_RESERVED = frozenset({'CON', 'PRN', 'AUX', 'NUL',
+                              *(f'COM{i}' for i in range(1, 10)),
+                              *(f'LPT{i}' for i in range(1, 10))})
+
+def build_exclude_index(exclude_patterns: List[str]) -> ExcludeIndex:
+    """
+    Groups exclusion patterns by their number of path parts.
+    Build this once and pass it to should_exclude when checking many paths.
+    """
+    by_length = {}
+    for pattern in exclude_patterns:
+        pattern_parts = Path(pattern).parts
+        by_length.setdefault(len(pattern_parts), set()).add(pattern_parts)
+    return {length: frozenset(patterns) for length, patterns in by_length.items()}
+
+@lru_cache(maxsize=32)
+def _exclude_index_for(exclude_patterns: Tuple[str, ...]) -> ExcludeIndex:
+    """Index for a pattern list passed straight to should_exclude, built once per list."""
+    return build_exclude_index(list(exclude_patterns))
+
+def should_exclude(path: Union[str, Path, Tuple[str, ...]], exclude_patterns: Union[List[str], ExcludeIndex]) -> bool:
     """
     Checks if a path matches any of the exclusion patterns.
     Patterns can be directory names or paths relative to the root.
+    The path may also be given already split, as a tuple of parts.
+    Accepts either a list of patterns or an index from build_exclude_index.
     """
-    if isinstance(path, str):
-        path = Path(path)
+    if not isinstance(exclude_patterns, dict):
+        exclude_patterns = _exclude_index_for(tuple(exclude_patterns))
     
     # Convert path to string parts for matching
-    path_parts = path.parts
+    if isinstance(path, tuple):
+        path_parts = path
+    elif isinstance(path, str):
+        path_parts = Path(path).parts
+    else:
+        path_parts = path.parts
     
-    for pattern in exclude_patterns:
-        pattern_parts = Path(pattern).parts
-        
-        # Check if pattern matches any part of the path
-        for i in range(len(path_parts) - len(pattern_parts) + 1):
-            if path_parts[i:i+len(pattern_parts)] == pattern_parts:
+    # Check if any pattern matches a run of consecutive parts of the path
+    for length, patterns in exclude_patterns.items():
+        for i in range(len(path_parts) - length + 1):
+            if path_parts[i:i+length] in patterns:
                 return True
     
     return False
 
 def validate_filepath(filepath: str) -> None:
     """Validates that a filepath is safe to use"""
-    if not filepath or '..' in filepath or filepath.startswith('/') or filepath.startswith('\\'):
+    # Cheapest checks first: prefix and substring tests
+    if not filepath or filepath[0] in ('/', '\\') or '..' in filepath:
         raise ValueError("Invalid filepath: must not contain '..' or start with '/' or '\\'")
     
+    # Block hidden files
+    if filepath[0] == '.':
+        raise ValueError("Hidden files are not allowed")
+    
     # Check for empty or whitespace-only names
     if not filepath.strip():
         raise ValueError("Filepath cannot be empty or whitespace")
     
-    # Check for reserved Windows names
-    WINDOWS_RESERVED = {'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
-                       'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2', 'LPT3',
-                       'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'}
-    name_without_ext = os.path.splitext(os.path.basename(filepath))[0].upper()
+    # Allow only safe characters (single scan, also rules out '\\' separators below)
+    if not _SAFE_PATH_RE.fullmatch(filepath):
+        invalid_chars = _INVALID_PATH_CHARS_RE.findall(filepath)
+        raise ValueError(f"Filepath contains invalid characters: {', '.join(repr(c) for c in invalid_chars)}")
+    
+    # Check for reserved Windows names (Windows ignores everything after the first '.')
+    name_without_ext = filepath.rsplit('/', 1)[-1].split('.', 1)[0].upper()
     if name_without_ext in WINDOWS_RESERVED:
         raise ValueError(f"Invalid filepath: {name_without_ext} is a reserved name")
-    
-    # Block hidden files
-    if filepath.startswith('.'):
-        raise ValueError("Hidden files are not allowed")
-    
-    # Allow only safe characters
-    safe_chars = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_./\'() ')
-    invalid_chars = [c for c in filepath if c not in safe_chars]
-    if invalid_chars:
-        raise ValueError(f"Filepath contains invalid characters: {', '.join(repr(c) for c in invalid_chars)}")
 
 def ensure_md_extension(filename: str) -> str:
     """Ensures the filename has a .md extension"""
@@ -1,14 +1,77 @@
 from ai_core.tools import tool
+import asyncio
 import json
+from utils.json_utils import dumps, loads
 import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
 
 # Lazy initialization - client is created only when needed
 _gmail_client = None
 _gmail_error = None
+# Message helpers from integrations.gmail_client, bound together with the client
+_filter_email_data = None
+_process_gmail_message = None
+# Async variants may initialize the client from several worker threads at once
+_gmail_lock = threading.Lock()
+
+# Caps concurrent Gmail calls and spaces their starts, to stay under the per-user quota
+_GMAIL_SEM = threading.BoundedSemaphore(10)
+_GMAIL_MIN_INTERVAL = 0.02
+_last_call = 0.0
+_rate_lock = threading.Lock()
+
+@contextmanager
+def _gmail_rate_gate():
+    """Hold a concurrency slot and wait out the minimum interval before a Gmail call."""
+    global _last_call
+    with _GMAIL_SEM:
+        with _rate_lock:
+            elapsed = time.monotonic() - _last_call
+            if elapsed < _GMAIL_MIN_INTERVAL:
+                time.sleep(_GMAIL_MIN_INTERVAL - elapsed)
+            _last_call = time.monotonic()
+        yield
+
+# Recent search_emails/list_recent_emails results: parameter tuple -> (monotonic timestamp, JSON payload)
+_search_cache: Dict[tuple, Tuple[float, str]] = {}
+_LIST_TTL = 60
+_SEARCH_CACHE_SIZE = 256
+# Tool calls run on worker threads, eviction must not race another thread's insert or clear
+_search_cache_lock = threading.Lock()
+
+def _cached_listing(key: tuple) -> Optional[str]:
+    """Return the cached payload for key if it is still fresh."""
+    hit = _search_cache.get(key)
+    if hit and time.monotonic() - hit[0] < _LIST_TTL:
+        return hit[1]
+    return None
+
+def _cache_listing(key: tuple, payload: str):
+    """Store a listing payload, evicting the oldest entry when full."""
+    with _search_cache_lock:
+        _search_cache.pop(key, None)
+        if len(_search_cache) >= _SEARCH_CACHE_SIZE:
+            _search_cache.pop(next(iter(_search_cache)))
+        _search_cache[key] = (time.monotonic(), payload)
+
+# Splits a comma-separated address list, trimming whitespace around each entry
+_ADDR_SPLIT = re.compile(r'\s*,\s*')
 
 def get_gmail_client():
     """Get or create the Gmail client. Returns (client, error_message)."""
-    global _gmail_client, _gmail_error
+    if _gmail_client is not None:
+        return _gmail_client, None
+    
+    with _gmail_lock:
+        return _create_gmail_client()
+
+def _create_gmail_client():
+    """Create the Gmail client once, must be called with _gmail_lock held."""
+    global _gmail_client, _gmail_error, _filter_email_data, _process_gmail_message
     
     if _gmail_client is not None:
         return _gmail_client, None
@@ -28,7 +91,9 @@ def get_gmail_client():
         return None, _gmail_error
     
     try:
-        from integrations.gmail_client import GmailClient
+        from integrations.gmail_client import GmailClient, filter_email_data, process_gmail_message
+        _filter_email_data = filter_email_data
+        _process_gmail_message = process_gmail_message
         _gmail_client = GmailClient()
         return _gmail_client, None
     except Exception as e:
@@ -60,21 +125,25 @@ def send_email(
     """Sends an email through Gmail"""
     client, error = get_gmail_client()
     if error:
-        return json.dumps({"error": error})
+        return dumps({"error": error})
     
     # Split recipients by comma and strip whitespace
-    to_list = [email.strip() for email in to.split(',') if email.strip()]
-    cc_list = [email.strip() for email in cc.split(',')] if cc else None
-    
-    result = client.send_email(
-        to=to_list,
-        subject=subject,
-        body=body,
-        cc=cc_list,
-        from_name=from_name,
-        from_email=from_email
-    )
-    return json.dumps(result)
+    to_list = [a for a in _ADDR_SPLIT.split(to.strip()) if a]
+    cc_list = [a for a in _ADDR_SPLIT.split(cc.strip()) if a] if cc else None
+    
+    with _gmail_rate_gate():
+        result = client.send_email(
+            to=to_list,
+            subject=subject,
+            body=body,
+            cc=cc_list,
+            from_name=from_name,
+            from_email=from_email
+        )
+    # The sent message shows up in later searches
+    with _search_cache_lock:
+        _search_cache.clear()
+    return dumps(result)
 
 @tool(
     description="Search for emails in Gmail using various filters. This tool provides a powerful way to search through "
@@ -102,19 +171,26 @@ def search_emails(
     """Searches for emails using various filters"""
     client, error = get_gmail_client()
     if error:
-        return json.dumps({"error": error})
-    
-    from integrations.gmail_client import filter_email_data, process_gmail_message
-    results = client.search_emails(
-        sender=sender,
-        subject=subject,
-        is_unread=is_unread,
-        has_attachment=has_attachment,
-        from_date=from_date,
-        to_date=to_date,
-        max_results=max_results
-    )
-    return json.dumps(results)
+        return dumps({"error": error})
+    
+    key = ('search', sender, subject, is_unread, has_attachment, from_date, to_date, max_results)
+    cached = _cached_listing(key)
+    if cached is not None:
+        return cached
+    
+    with _gmail_rate_gate():
+        results = client.search_emails(
+            sender=sender,
+            subject=subject,
+            is_unread=is_unread,
+            has_attachment=has_attachment,
+            from_date=from_date,
+            to_date=to_date,
+            max_results=max_results
+        )
+    payload = dumps(results)
+    _cache_listing(key, payload)
+    return payload
 
 @tool(
     description="Retrieve the full content and details of a specific email message. This tool fetches comprehensive "
@@ -128,14 +204,41 @@ def get_email_content(message_id: str, simplified: bool = True) -> str:
     """Gets the full content of a specific email"""
     client, error = get_gmail_client()
     if error:
-        return json.dumps({"error": error})
+        return dumps({"error": error})
+    
+    with _gmail_rate_gate():
+        message = client.get_email(message_id)
+    if simplified:
+        message = _process_gmail_message(message)
+        message = _filter_email_data(message)
+    return dumps(message)
+
+@tool(
+    description="Retrieve the full content of several email messages at once. Fetches the messages in batched "
+                "requests, which is much faster than calling get_email_content for each message. Use this after "
+                "finding message IDs through search_emails or list_recent_emails.",
+    message_ids="JSON array of message IDs to retrieve (e.g., '[\"18c1...\", \"18c2...\"]')",
+    simplified="If True, the email contents will be decoded and simplified to a single string",
+    safe=True
+)
+def get_emails_content_bulk(message_ids: str, simplified: bool = True) -> str:
+    """Gets the full content of several emails in batched requests"""
+    client, error = get_gmail_client()
+    if error:
+        return dumps({"error": error})
     
-    from integrations.gmail_client import filter_email_data, process_gmail_message
-    message = client.get_email(message_id)
+    try:
+        ids = loads(message_ids)
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            return dumps({"error": "message_ids must be a JSON array of strings"})
+    except json.JSONDecodeError as e:
+        return dumps({"error": f"Invalid JSON for message_ids: {str(e)}"})
+    
+    with _gmail_rate_gate():
+        messages = client.get_emails(ids)
     if simplified:
-        message = process_gmail_message(message)
-        message = filter_email_data(message)
-    return json.dumps(message)
+        messages = [_filter_email_data(_process_gmail_message(m)) for m in messages]
+    return dumps(dict(zip(ids, messages)))
 
 @tool(
     description="List recent emails from your Gmail inbox. This tool provides a simple way to fetch recent messages "
@@ -154,16 +257,24 @@ def list_recent_emails(
     """Lists recent emails with optional filtering"""
     client, error = get_gmail_client()
     if error:
-        return json.dumps({"error": error})
+        return dumps({"error": error})
+    
+    key = ('list', query, label_ids, max_results)
+    cached = _cached_listing(key)
+    if cached is not None:
+        return cached
     
     if label_ids:
-        label_ids = json.loads(label_ids)
-    messages = client.list_emails(
-        query=query,
-        label_ids=label_ids,
-        max_results=max_results
-    )
-    return json.dumps(messages)
+        label_ids = loads(label_ids)
+    with _gmail_rate_gate():
+        messages = client.list_emails(
+            query=query,
+            label_ids=label_ids,
+            max_results=max_results
+        )
+    payload = dumps(messages)
+    _cache_listing(key, payload)
+    return payload
 
 @tool(
     description="List all attachments in an email without downloading them. This is useful to see what attachments "
@@ -176,10 +287,11 @@ def list_email_attachments(message_id: str) -> str:
     """Lists all attachments in a specific email"""
     client, error = get_gmail_client()
     if error:
-        return json.dumps({"error": error})
+        return dumps({"error": error})
     
-    attachments = client.list_attachments(message_id)
-    return json.dumps({
+    with _gmail_rate_gate():
+        attachments = client.list_attachments(message_id)
+    return dumps({
         "message_id": message_id,
         "attachment_count": len(attachments),
         "attachments": attachments
@@ -199,25 +311,26 @@ def download_email_attachments(message_id: str, download_path: str, filenames: s
     """Downloads specific attachments from an email to a folder"""
     client, error = get_gmail_client()
     if error:
-        return json.dumps({"error": error})
+        return dumps({"error": error})
     
     # Parse the filenames list
     try:
-        filenames_list = json.loads(filenames)
+        filenames_list = loads(filenames)
         if not isinstance(filenames_list, list):
-            return json.dumps({"error": "filenames must be a JSON array of strings"})
+            return dumps({"error": "filenames must be a JSON array of strings"})
     except json.JSONDecodeError as e:
-        return json.dumps({"error": f"Invalid JSON for filenames: {str(e)}"})
+        return dumps({"error": f"Invalid JSON for filenames: {str(e)}"})
     
     # Expand user home directory if path starts with ~
     download_path = os.path.expanduser(download_path)
     
-    results = client.download_attachments(message_id, download_path, filenames_list)
+    with _gmail_rate_gate():
+        results = client.download_attachments(message_id, download_path, filenames_list)
     
     successful = sum(1 for r in results if r['success'])
     failed = len(results) - successful
     
-    return json.dumps({
+    return dumps({
         "message_id": message_id,
         "download_path": download_path,
         "requested_files": filenames_list,
@@ -226,11 +339,44 @@ def download_email_attachments(message_id: str, download_path: str, filenames: s
         "files": results
     })
 
+# --- Async variants ---
+# The tool dispatcher calls tools synchronously, so these are not part of TOOLS.
+# They let asyncio hosts overlap Gmail API round-trips instead of blocking the loop.
+
+async def send_email_async(**kwargs) -> str:
+    """Async variant of send_email, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(send_email.tool.func, **kwargs)
+
+async def search_emails_async(**kwargs) -> str:
+    """Async variant of search_emails, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(search_emails.tool.func, **kwargs)
+
+async def get_email_content_async(**kwargs) -> str:
+    """Async variant of get_email_content, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(get_email_content.tool.func, **kwargs)
+
+async def get_emails_content_bulk_async(**kwargs) -> str:
+    """Async variant of get_emails_content_bulk, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(get_emails_content_bulk.tool.func, **kwargs)
+
+async def list_recent_emails_async(**kwargs) -> str:
+    """Async variant of list_recent_emails, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(list_recent_emails.tool.func, **kwargs)
+
+async def list_email_attachments_async(**kwargs) -> str:
+    """Async variant of list_email_attachments, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(list_email_attachments.tool.func, **kwargs)
+
+async def download_email_attachments_async(**kwargs) -> str:
+    """Async variant of download_email_attachments, runs the blocking Gmail call in a worker thread"""
+    return await asyncio.to_thread(download_email_attachments.tool.func, **kwargs)
+
 # Export the tools
 TOOLS = [
     send_email,
     search_emails,
     get_email_content,
+    get_emails_content_bulk,
     list_recent_emails,
     list_email_attachments,
     download_email_attachments
@@ -11,10 +11,18 @@ Designed for efficient navigation of large vaults:
 from ai_core.tools import tool
 from pathlib import Path
 from config.paths import PATHS
-from .file_utils import validate_filepath, ensure_md_extension, should_exclude
+from .file_utils import validate_filepath, ensure_md_extension, should_exclude, build_exclude_index
 import os
 import re
-from typing import Optional
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from stat import S_ISDIR
+from typing import FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
 
 # Directories to exclude from AI access
 VAULT_EXCLUDE = [
@@ -25,19 +33,83 @@ VAULT_EXCLUDE = [
     ".trash",             # Deleted files
     ".git",               # Git data if vault is versioned
 ]
+_VAULT_EXCLUDE_INDEX = build_exclude_index(VAULT_EXCLUDE)
+# Single directory names to prune while walking the vault
+_VAULT_EXCLUDE_NAMES = frozenset(VAULT_EXCLUDE)
+# The vault root, resolved once instead of on every root-level lookup
+_VAULT_ROOT = PATHS.vault_path.resolve()
+
+# list_vault stops counting a subdirectory's items here
+_DIR_COUNT_CAP = 1000
+# Sorts DirEntry objects like Path objects: by name, case-insensitively on Windows
+_entry_sort_key = (
+    attrgetter('name') if os.path.normcase('A') == 'A'
+    else (lambda entry: os.path.normcase(entry.name))
+)
+
+# Notes are read concurrently; search_vault does so in batches so it can stop early
+_SEARCH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_SEARCH_BATCH_SIZE = 64
+
+# Trigram full-text index of note contents. search_vault only reads the notes it
+# returns as candidates; the linear scan is used when SQLite lacks FTS5.
+_SEARCH_INDEX_PATH = PATHS.data / "vault_search_index.sqlite"
+_search_index_lock = threading.Lock()
+_search_index_disabled = False
+
+# read_note streams notes larger than this instead of loading and caching them
+_STREAM_NOTE_BYTES = 4 * 1024 * 1024
+
+# read_note warms the note cache for up to _PREFETCH_LINKS notes linked from the
+# returned lines, in the background
+_PREFETCH_LINKS = 8
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='note-prefetch')
+
+# Resolved paths are reused for up to _RESOLVE_TTL seconds. The bound keeps a
+# symlink swapped in later from being followed on the strength of an old check.
+_RESOLVE_TTL = 5
+
+# Vault-relative note paths without '.md' (casefolded on case-insensitive filesystems),
+# rebuilt after _STEM_TTL seconds
+_stem_cache: Optional[Tuple[float, FrozenSet[str]]] = None
+_STEM_TTL = 60
+
+# Markdown heading lines, matched over a whole note: captures the #'s and the heading text.
+# [^\S\n] is whitespace that cannot run onto the next line.
+_HEADING_RE = re.compile(r'^(#{1,6})[^\S\n]+(.+)$', re.MULTILINE)
+# Closing frontmatter delimiter: a line that is only '---' plus whitespace
+_FRONTMATTER_END_RE = re.compile(r'^[^\S\n]*---[^\S\n]*$', re.MULTILINE)
+# Frontmatter the key: value scan can't represent: block-list items, or flow [...] / {...} values
+_YAML_STRUCTURE_RE = re.compile(r'^[^\S\n]*- |^[^:\n]*:[^\S\n]*[\[{]', re.MULTILINE)
+# Match [[link]] or [[link|alias]]
+# Headings and links are found by separate scans on purpose: one alternation over
+# both loses re's literal-prefix search ('[[') and ran ~2.5x slower, and a heading
+# match would swallow the links on its line.
+_WIKILINK_RE = re.compile(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]')
 
 def _resolve_vault_path(filepath: str, is_dir: bool = False) -> Path:
     """Resolve and validate a path within the vault."""
+    return _resolve_vault_path_cached(filepath, is_dir, int(time.monotonic() // _RESOLVE_TTL))
+
+
+@lru_cache(maxsize=1024)
+def _resolve_vault_path_cached(filepath: str, is_dir: bool, epoch: int) -> Path:
+    """Does the work of _resolve_vault_path, cached within an epoch. Errors are not cached."""
     if filepath and not is_dir:
         validate_filepath(filepath)
         filepath = ensure_md_extension(filepath)
     elif filepath:
         validate_filepath(filepath)
     
-    if filepath and should_exclude(filepath, VAULT_EXCLUDE):
+    # validate_filepath leaves '/' as the only separator, so a split gives the
+    # same parts as Path(filepath).parts
+    if filepath and should_exclude(
+        tuple(part for part in filepath.split('/') if part and part != '.'),
+        _VAULT_EXCLUDE_INDEX
+    ):
         raise ValueError(f"Access to {filepath} is not allowed")
     
-    full_path = (PATHS.vault_path / filepath).resolve() if filepath else PATHS.vault_path.resolve()
+    full_path = (PATHS.vault_path / filepath).resolve() if filepath else _VAULT_ROOT
     
     try:
         full_path.relative_to(PATHS.vault_path)
@@ -50,14 +122,16 @@ def _resolve_vault_path(filepath: str, is_dir: bool = False) -> Path:
 def _extract_headings(content: str) -> list:
     """Extract all markdown headings with their line numbers."""
     headings = []
-    for i, line in enumerate(content.split('\n'), 1):
-        match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if match:
-            headings.append({
-                'level': len(match.group(1)),
-                'text': match.group(2).strip(),
-                'line': i
-            })
+    line = 1
+    counted_to = 0
+    for match in _HEADING_RE.finditer(content):
+        line += content.count('\n', counted_to, match.start())
+        counted_to = match.start()
+        headings.append({
+            'level': len(match.group(1)),
+            'text': match.group(2).strip(),
+            'line': line
+        })
     return headings
 
 
@@ -66,34 +140,242 @@ def _extract_frontmatter(content: str) -> tuple:
     if not content.startswith('---'):
         return {}, 0
     
-    lines = content.split('\n')
-    end_idx = None
-    for i, line in enumerate(lines[1:], 1):
-        if line.strip() == '---':
-            end_idx = i
-            break
-    
-    if end_idx is None:
+    first_nl = content.find('\n')
+    if first_nl < 0:
+        return {}, 0
+    closing = _FRONTMATTER_END_RE.search(content, first_nl + 1)
+    if closing is None:
         return {}, 0
     
+    block = content[first_nl + 1:closing.start()]
+    end_idx = content.count('\n', 0, closing.start())
+    
     # Parse simple key: value pairs
     metadata = {}
-    for line in lines[1:end_idx]:
+    for line in block.split('\n'):
         if ':' in line:
             key, _, value = line.partition(':')
             metadata[key.strip()] = value.strip()
     
+    if _YAML_STRUCTURE_RE.search(block):
+        # Lists or mappings, which the key: value scan drops. BaseLoader keeps every
+        # scalar a string (no dates, numbers or yes/no booleans), and top-level scalars
+        # keep the scan's raw text, so only the structured values differ from it.
+        import yaml
+        try:
+            structured = yaml.load(block, Loader=yaml.BaseLoader)
+        except yaml.YAMLError:
+            structured = None
+        if isinstance(structured, dict):
+            metadata = {
+                key: value if isinstance(value, (list, dict)) or key not in metadata else metadata[key]
+                for key, value in structured.items()
+            }
+    
     return metadata, end_idx + 1
 
 
 def _extract_wikilinks(content: str) -> list:
     """Extract all [[wikilinks]] from content."""
-    # Match [[link]] or [[link|alias]]
-    pattern = r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]'
-    links = re.findall(pattern, content)
+    links = _WIKILINK_RE.findall(content)
     return list(dict.fromkeys(links))  # Remove duplicates, preserve order
 
 
+class _ParsedNote(NamedTuple):
+    """Parsed note contents, shared between tool calls. Treat as read-only."""
+    lines: List[str]
+    frontmatter: dict
+    headings: list
+    links: list
+    size_bytes: int
+
+
+@lru_cache(maxsize=512)
+def _parse_note_cached(path_str: str, mtime_ns: int, size: int) -> _ParsedNote:
+    """
+    Read and parse a note. Keyed on mtime and size, so edits miss the cache.
+    The reported size is the stat size, not a re-encoding of the content.
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    frontmatter, _ = _extract_frontmatter(content)
+    return _ParsedNote(
+        lines=content.split('\n'),
+        frontmatter=frontmatter,
+        headings=_extract_headings(content),
+        links=_extract_wikilinks(content),
+        size_bytes=size,
+    )
+
+
+@lru_cache(maxsize=256)
+def _read_note_raw(path_str: str, mtime_ns: int, size: int) -> Tuple[bytes, int]:
+    """
+    Read a note's bytes in one call, with newlines normalized, and count its lines.
+    Keyed on mtime and size like _parse_note_cached, so edits miss the cache.
+    """
+    with open(path_str, 'rb') as f:
+        raw = f.read()
+    if b'\r' in raw:
+        # Universal newlines, as in text mode (CR never occurs inside a UTF-8 sequence)
+        raw = raw.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    total_lines = raw.count(b'\n') + (1 if raw and not raw.endswith(b'\n') else 0)
+    return raw, total_lines
+
+
+def _stat_existing(path: Path) -> Optional[os.stat_result]:
+    """Stat a path, or return None where Path.exists() would be False."""
+    try:
+        return path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _parse_note(full_path: Path, stat: Optional[os.stat_result] = None) -> _ParsedNote:
+    """
+    Parse a note, reusing the previous result while the file is unchanged.
+    Callers that already stat'ed the note pass the result to skip a second stat.
+    """
+    if stat is None:
+        stat = full_path.stat()
+    return _parse_note_cached(str(full_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _walk_md(root) -> Iterator[os.DirEntry]:
+    """
+    Yield markdown file entries under root, in the same order as Path.rglob('*.md').
+    Excluded directories are pruned instead of walked and filtered afterwards.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                subdirs = []
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _VAULT_EXCLUDE_NAMES:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        yield entry
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+def _skip_lines(raw: bytes, count: int, pos: int) -> int:
+    """Return the offset just past the next count lines of raw from pos, or len(raw)."""
+    for _ in range(count):
+        pos = raw.find(b'\n', pos) + 1
+        if not pos:
+            return len(raw)
+    return pos
+
+
+def _prefetch_note(link: str) -> None:
+    """Load a linked note into the read_note cache. Errors are ignored."""
+    try:
+        full_path = _resolve_vault_path(link)
+        stat = full_path.stat()
+        # read_note streams these from disk, caching them would only waste memory
+        if stat.st_size > _STREAM_NOTE_BYTES:
+            return
+        _read_note_raw(str(full_path), stat.st_mtime_ns, stat.st_size)
+    except Exception:
+        pass
+
+
+def _prefetch_links(text: str) -> None:
+    """Queue the first _PREFETCH_LINKS distinct wikilink targets in text for prefetching."""
+    targets = dict.fromkeys(
+        link.partition('#')[0].strip() for link in _WIKILINK_RE.findall(text)
+    )
+    targets.pop('', None)
+    for link in islice(targets, _PREFETCH_LINKS):
+        _prefetch_pool.submit(_prefetch_note, link)
+
+
+def _map_parallel(func, items: list) -> list:
+    """Apply func to each item on a thread pool, returning the results in order."""
+    if len(items) < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_SEARCH_WORKERS, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+@lru_cache(maxsize=None)
+def _is_case_insensitive(root: str) -> bool:
+    """Whether the filesystem holding root matches names case-insensitively (macOS, Windows)."""
+    swapped = root.swapcase()
+    if swapped == root:
+        return os.name == 'nt'
+    try:
+        return os.path.samefile(root, swapped)
+    except OSError:
+        return False
+
+
+def _stem_key(stem: str, root: str) -> str:
+    """The form of a note path kept in the _vault_stems set."""
+    return stem.casefold() if _is_case_insensitive(root) else stem
+
+
+def _vault_stems() -> FrozenSet[str]:
+    """
+    Return the set of note paths in the vault, relative to the root and without '.md'.
+    One directory walk answers every link-existence check until the TTL expires.
+    Paths are casefolded when the filesystem ignores case, look them up with _stem_key.
+    """
+    global _stem_cache
+    now = time.monotonic()
+    if _stem_cache is not None and now - _stem_cache[0] < _STEM_TTL:
+        return _stem_cache[1]
+    root = str(PATHS.vault_path)
+    stems = frozenset(
+        _stem_key(os.path.relpath(entry.path, root)[:-3].replace(os.sep, '/'), root)
+        for entry in _walk_md(root)
+    )
+    _stem_cache = (now, stems)
+    return stems
+
+
+def _find_line_matches(content: str, query_lower: str, max_previews: int) -> Tuple[list, int]:
+    """
+    Find lines containing query_lower (case-insensitive) without splitting the whole note.
+    Returns the first max_previews (line number, preview) pairs and the number of matching lines.
+    """
+    content_lower = content.lower()
+    if len(content_lower) != len(content) or '\n' in query_lower:
+        # Lowercasing shifted offsets (or the query spans lines), scan line by line
+        found = [
+            (i, line.strip()[:100])
+            for i, line in enumerate(content.split('\n'), 1)
+            if query_lower in line.lower()
+        ]
+        return found[:max_previews], len(found)
+    
+    previews = []
+    total = 0
+    line_no = 1
+    counted_to = 0
+    pos = content_lower.find(query_lower)
+    while pos >= 0:
+        line_start = content.rfind('\n', 0, pos) + 1
+        line_end = content.find('\n', pos)
+        if line_end < 0:
+            line_end = len(content)
+        total += 1
+        if len(previews) < max_previews:
+            line_no += content.count('\n', counted_to, line_start)
+            counted_to = line_start
+            previews.append((line_no, content[line_start:line_end].strip()[:100]))
+        if line_end == len(content):
+            break
+        # One hit per line, continue from the next line
+        pos = content_lower.find(query_lower, line_end + 1)
+    return previews, total
+
+
 def _format_size(size_bytes: int) -> str:
     """Format byte size to human readable."""
     if size_bytes < 1024:
@@ -104,6 +386,19 @@ def _format_size(size_bytes: int) -> str:
         return f"{size_bytes // (1024 * 1024)}MB"
 
 
+def _count_bounded(path: str, cap: int = _DIR_COUNT_CAP) -> str:
+    """Count the non-hidden entries of a directory, stopping past cap ("1000+")."""
+    count = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith('.'):
+                continue
+            count += 1
+            if count > cap:
+                return f"{cap}+"
+    return str(count)
+
+
 @tool(
     description="""List files and directories in the vault. Shows file sizes to help decide what to read.
     Use this to explore the vault structure before diving into specific notes.""",
@@ -117,28 +412,35 @@ def list_vault(directory: str = "") -> str:
     except ValueError as e:
         return f"Error: {e}"
     
-    if not full_path.exists():
+    stat = _stat_existing(full_path)
+    if stat is None:
         return f"Error: Directory '{directory}' does not exist"
-    if not full_path.is_dir():
+    if not S_ISDIR(stat.st_mode):
         return f"Error: '{directory}' is not a directory"
     
     dirs = []
     files = []
     
-    for item in sorted(full_path.iterdir()):
-        if should_exclude(item.name, VAULT_EXCLUDE) or item.name.startswith('.'):
-            continue
-        
-        if item.is_dir():
+    # Only what gets listed is sorted: visible directories and notes
+    with os.scandir(full_path) as it:
+        entries = [
+            e for e in it
+            if e.name not in _VAULT_EXCLUDE_NAMES and not e.name.startswith('.')
+            and (e.name.endswith('.md') or e.is_dir())
+        ]
+    entries.sort(key=_entry_sort_key)
+    
+    for entry in entries:
+        if entry.is_dir():
             # Count items in directory
             try:
-                count = sum(1 for _ in item.iterdir() if not _.name.startswith('.'))
-                dirs.append(f"📁 {item.name}/ ({count} items)")
-            except:
-                dirs.append(f"📁 {item.name}/")
-        elif item.suffix == '.md':
-            size = _format_size(item.stat().st_size)
-            files.append(f"📄 {item.name} [{size}]")
+                count = _count_bounded(entry.path)
+                dirs.append(f"📁 {entry.name}/ ({count} items)")
+            except OSError:
+                dirs.append(f"📁 {entry.name}/")
+        elif entry.name.endswith('.md'):
+            size = _format_size(entry.stat().st_size)
+            files.append(f"📄 {entry.name} [{size}]")
     
     result = []
     if directory:
@@ -176,20 +478,18 @@ def get_note_outline(filepath: str) -> str:
     except ValueError as e:
         return f"Error: {e}"
     
-    if not full_path.exists():
+    stat = _stat_existing(full_path)
+    if stat is None:
         return f"Error: Note '{filepath}' does not exist"
     
-    with open(full_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    lines = content.split('\n')
-    total_lines = len(lines)
-    size = _format_size(len(content.encode('utf-8')))
+    note = _parse_note(full_path, stat)
+    total_lines = len(note.lines)
+    size = _format_size(note.size_bytes)
     
     # Extract components
-    frontmatter, fm_end = _extract_frontmatter(content)
-    headings = _extract_headings(content)
-    links = _extract_wikilinks(content)
+    frontmatter = note.frontmatter
+    headings = note.headings
+    links = note.links
     
     result = [f"📄 {filepath}", f"Size: {size} | Lines: {total_lines}", ""]
     
@@ -232,23 +532,40 @@ def read_note(filepath: str, offset: int = 1, limit: int = 200) -> str:
     except ValueError as e:
         return f"Error: {e}"
     
-    if not full_path.exists():
+    stat = _stat_existing(full_path)
+    if stat is None:
         return f"Error: Note '{filepath}' does not exist"
     
-    with open(full_path, 'r', encoding='utf-8') as f:
-        all_lines = f.readlines()
-    
-    total_lines = len(all_lines)
     offset = max(1, offset)  # Ensure offset is at least 1
     start_idx = offset - 1   # Convert to 0-based
+    
+    if stat.st_size > _STREAM_NOTE_BYTES:
+        # Large notes are streamed: only the window is kept, and nothing is cached
+        with open(full_path, 'r', encoding='utf-8') as f:
+            skipped = sum(1 for _ in islice(f, start_idx))
+            text = ''.join(islice(f, max(0, limit)))
+            total_lines = skipped + text.count('\n') + (1 if text and not text.endswith('\n') else 0)
+            total_lines += sum(1 for _ in f)
+    else:
+        # Lines are counted on the bytes and only the requested window is decoded
+        raw, total_lines = _read_note_raw(str(full_path), stat.st_mtime_ns, stat.st_size)
+        window_start = _skip_lines(raw, start_idx, 0)
+        window_end = _skip_lines(raw, max(0, limit), window_start)
+        text = raw[window_start:window_end].decode('utf-8')
+    
+    # Notes linked from what is returned are likely the next reads
+    if '[[' in text:
+        _prefetch_links(text)
+    window = text.split('\n')
+    if window[-1] == '':
+        window.pop()
+    
     end_idx = min(start_idx + limit, total_lines)
     
     result = [f"📄 {filepath} (lines {offset}-{end_idx} of {total_lines})"]
     result.append("-" * 60)
     
-    for i in range(start_idx, end_idx):
-        line_num = i + 1
-        line_content = all_lines[i].rstrip('\n')
+    for line_num, line_content in enumerate(window, offset):
         result.append(f"{line_num:6}|{line_content}")
     
     if end_idx < total_lines:
@@ -274,14 +591,13 @@ def read_note_section(filepath: str, heading: str) -> str:
     except ValueError as e:
         return f"Error: {e}"
     
-    if not full_path.exists():
+    stat = _stat_existing(full_path)
+    if stat is None:
         return f"Error: Note '{filepath}' does not exist"
     
-    with open(full_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    lines = content.split('\n')
-    headings = _extract_headings(content)
+    note = _parse_note(full_path, stat)
+    lines = note.lines
+    headings = note.headings
     
     # Find the target heading
     target = None
@@ -315,6 +631,129 @@ def read_note_section(filepath: str, heading: str) -> str:
     return '\n'.join(result)
 
 
+def _open_search_index() -> Optional[sqlite3.Connection]:
+    """Open the search index, creating it on first use. Returns None if it is unavailable."""
+    global _search_index_disabled
+    if _search_index_disabled:
+        return None
+    conn = None
+    try:
+        _SEARCH_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(_SEARCH_INDEX_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta "
+            "(id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime_ns INTEGER, size INTEGER)"
+        )
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS notes USING fts5(content, tokenize='trigram')")
+        return conn
+    except (sqlite3.Error, OSError):
+        if conn is not None:
+            conn.close()
+        _search_index_disabled = True
+        return None
+
+
+def _read_index_text(path: str) -> str:
+    """Note content as _scan_note sees it. Unreadable notes are indexed as empty."""
+    try:
+        with open(path, 'rb') as f:
+            content = f.read().decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return ''
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _index_candidates(entries: List[os.DirEntry], query_lower: str, prune: bool) -> Optional[set]:
+    """
+    Re-index the entries whose mtime or size changed, then return the paths of notes
+    whose content contains query_lower, ignoring ASCII case. Returns None when the
+    index cannot be used. With prune, indexed notes of this vault missing from
+    entries are dropped.
+    """
+    conn = _open_search_index()
+    if conn is None:
+        return None
+    try:
+        with _search_index_lock, conn:
+            indexed = {
+                path: (row_id, mtime_ns, size)
+                for row_id, path, mtime_ns, size in conn.execute("SELECT id, path, mtime_ns, size FROM meta")
+            }
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                known = indexed.pop(entry.path, None)
+                if known is not None and known[1:] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                if known is not None:
+                    row_id = known[0]
+                    conn.execute("UPDATE meta SET mtime_ns = ?, size = ? WHERE id = ?",
+                                 (stat.st_mtime_ns, stat.st_size, row_id))
+                    conn.execute("DELETE FROM notes WHERE rowid = ?", (row_id,))
+                else:
+                    row_id = conn.execute("INSERT INTO meta (path, mtime_ns, size) VALUES (?, ?, ?)",
+                                          (entry.path, stat.st_mtime_ns, stat.st_size)).lastrowid
+                conn.execute("INSERT INTO notes (rowid, content) VALUES (?, ?)",
+                             (row_id, _read_index_text(entry.path)))
+            if prune:
+                root = os.path.join(str(PATHS.vault_path), '')
+                stale = [(row[0],) for path, row in indexed.items() if path.startswith(root)]
+                conn.executemany("DELETE FROM meta WHERE id = ?", stale)
+                conn.executemany("DELETE FROM notes WHERE rowid = ?", stale)
+            
+            # LIKE ignores ASCII case only, the same as the byte prefilter in _scan_note
+            pattern = query_lower.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            rows = conn.execute(
+                "SELECT meta.path FROM notes JOIN meta ON meta.id = notes.rowid "
+                "WHERE notes.content LIKE ? ESCAPE '\\'",
+                (f'%{pattern}%',)
+            )
+            return {path for (path,) in rows}
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def _scan_note(entry: os.DirEntry, query_lower: str, query_bytes: Optional[bytes]) -> Optional[dict]:
+    """Search one note for search_vault. Returns its match record, or None."""
+    # Check filename match
+    name_match = query_lower in entry.name[:-3].lower()
+    
+    try:
+        with open(entry.path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return None
+    
+    # Skip decoding notes that cannot match
+    if not name_match and query_bytes is not None and query_bytes not in raw.lower():
+        return None
+    
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # Find content matches with context (first 3 matches)
+    content_matches, total_matches = _find_line_matches(content, query_lower, 3)
+    
+    if not (name_match or content_matches):
+        return None
+    return {
+        'path': str(Path(entry.path).relative_to(PATHS.vault_path)),
+        'name_match': name_match,
+        'content_matches': content_matches,
+        'total_matches': total_matches
+    }
+
+
 @tool(
     description="""Search for text across notes in the vault. Returns matching notes with context.
     Searches file names and content. Use to find relevant notes before reading them.""",
@@ -334,41 +773,34 @@ def search_vault(query: str, directory: str = "", max_results: int = 10) -> str:
         return f"Error: Directory '{directory}' does not exist"
     
     query_lower = query.lower()
+    # Byte-level prefilter, only exact for ASCII queries
+    query_bytes = query_lower.encode('ascii') if query_lower.isascii() else None
     matches = []
     
-    # Search all markdown files
-    for md_file in search_path.rglob('*.md'):
-        # Skip excluded directories
-        rel_path = md_file.relative_to(PATHS.vault_path)
-        if any(part in VAULT_EXCLUDE for part in rel_path.parts):
-            continue
-        
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
-            continue
-        
-        # Check filename match
-        name_match = query_lower in md_file.stem.lower()
-        
-        # Find content matches with context
-        content_matches = []
-        lines = content.split('\n')
-        for i, line in enumerate(lines, 1):
-            if query_lower in line.lower():
-                content_matches.append((i, line.strip()[:100]))
-        
-        if name_match or content_matches:
-            matches.append({
-                'path': str(rel_path),
-                'name_match': name_match,
-                'content_matches': content_matches[:3],  # First 3 matches
-                'total_matches': len(content_matches)
-            })
-        
-        if len(matches) >= max_results:
-            break
+    # Search all markdown files, excluded directories are never entered.
+    # Notes are scanned in parallel batches; map keeps walk order, so the
+    # first max_results hits are the same as with a serial scan.
+    entries = _walk_md(search_path)
+    if query_bytes is not None:
+        # Only notes the index reports (or whose name matches) can be hits
+        entries = list(entries)
+        candidates = _index_candidates(entries, query_lower, prune=search_path == PATHS.vault_path)
+        if candidates is not None:
+            entries = [
+                e for e in entries
+                if e.path in candidates or query_lower in e.name[:-3].lower()
+            ]
+        entries = iter(entries)
+    with ThreadPoolExecutor(max_workers=_SEARCH_WORKERS) as pool:
+        while len(matches) < max_results:
+            batch = list(islice(entries, _SEARCH_BATCH_SIZE))
+            if not batch:
+                break
+            for match in pool.map(lambda e: _scan_note(e, query_lower, query_bytes), batch):
+                if match:
+                    matches.append(match)
+                    if len(matches) >= max_results:
+                        break
     
     if not matches:
         return f"No notes found matching '{query}'"
@@ -403,13 +835,11 @@ def get_note_links(filepath: str) -> str:
     except ValueError as e:
         return f"Error: {e}"
     
-    if not full_path.exists():
+    stat = _stat_existing(full_path)
+    if stat is None:
         return f"Error: Note '{filepath}' does not exist"
     
-    with open(full_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    links = _extract_wikilinks(content)
+    links = _parse_note(full_path, stat).links
     
     if not links:
         return f"No wikilinks found in {filepath}"
@@ -417,10 +847,13 @@ def get_note_links(filepath: str) -> str:
     result = [f"Links in {filepath} ({len(links)} total):"]
     result.append("")
     
+    stems = _vault_stems()
+    root = str(PATHS.vault_path)
     for link in links:
-        # Check if linked note exists
-        link_path = PATHS.vault_path / f"{link}.md"
-        exists = "✓" if link_path.exists() else "✗"
+        # Check if linked note exists. The set can be up to _STEM_TTL seconds old,
+        # so a miss is confirmed on disk in case the note was created since.
+        found = _stem_key(link, root) in stems or (PATHS.vault_path / f"{link}.md").exists()
+        exists = "✓" if found else "✗"
         result.append(f"  {exists} [[{link}]]")
     
     return '\n'.join(result)
@@ -489,14 +922,13 @@ def find_files(pattern: str, directory: str = "", max_results: int = 50) -> str:
     pattern_lower = pattern.lower().replace('*', '')
     matches = []
     
-    for md_file in search_path.rglob('*.md'):
-        rel_path = md_file.relative_to(PATHS.vault_path)
-        if any(part in VAULT_EXCLUDE for part in rel_path.parts):
-            continue
+    for entry in _walk_md(search_path):
+        md_file = Path(entry.path)
         
         # Check if pattern matches filename
         if pattern_lower in md_file.stem.lower():
-            size = _format_size(md_file.stat().st_size)
+            rel_path = md_file.relative_to(PATHS.vault_path)
+            size = _format_size(entry.stat().st_size)
             matches.append((str(rel_path), size))
         
         if len(matches) >= max_results:
@@ -551,10 +983,8 @@ def search_by_date(
     pattern_lower = filename_pattern.lower() if filename_pattern else ""
     matches = []
     
-    for md_file in search_path.rglob('*.md'):
-        rel_path = md_file.relative_to(PATHS.vault_path)
-        if any(part in VAULT_EXCLUDE for part in rel_path.parts):
-            continue
+    for entry in _walk_md(search_path):
+        md_file = Path(entry.path)
         
         # Check additional pattern filter
         if pattern_lower and pattern_lower not in md_file.stem.lower():
@@ -564,7 +994,7 @@ def search_by_date(
         
         if use_mtime:
             # Use file modification time
-            mtime = datetime.fromtimestamp(md_file.stat().st_mtime)
+            mtime = datetime.fromtimestamp(entry.stat().st_mtime)
             file_date = mtime.replace(hour=0, minute=0, second=0, microsecond=0)
         else:
             # Extract date from filename
@@ -576,7 +1006,8 @@ def search_by_date(
                     continue
         
         if file_date and start <= file_date <= end:
-            size = _format_size(md_file.stat().st_size)
+            rel_path = md_file.relative_to(PATHS.vault_path)
+            size = _format_size(entry.stat().st_size)
             date_str = file_date.strftime("%Y-%m-%d")
             matches.append((date_str, str(rel_path), size))
     
@@ -619,13 +1050,12 @@ def get_backlinks(filepath: str, max_results: int = 30) -> str:
     
     backlinks = []
     
-    for md_file in PATHS.vault_path.rglob('*.md'):
+    for entry in _walk_md(PATHS.vault_path):
+        md_file = Path(entry.path)
         if md_file == full_path:
             continue
         
         rel_path = md_file.relative_to(PATHS.vault_path)
-        if any(part in VAULT_EXCLUDE for part in rel_path.parts):
-            continue
         
         try:
             with open(md_file, 'r', encoding='utf-8') as f:
@@ -667,6 +1097,31 @@ def get_backlinks(filepath: str, max_results: int = 30) -> str:
     return '\n'.join(result)
 
 
+def _outline_lines(filepath: str) -> List[str]:
+    """Output lines for one note in get_outlines."""
+    try:
+        full_path = _resolve_vault_path(filepath)
+    except ValueError as e:
+        return [f"\n📄 {filepath}: Error - {e}"]
+    
+    stat = _stat_existing(full_path)
+    if stat is None:
+        return [f"\n📄 {filepath}: Not found"]
+    
+    note = _parse_note(full_path, stat)
+    lines = note.lines
+    headings = note.headings
+    
+    result = [f"\n📄 {filepath} ({len(lines)} lines)"]
+    if headings:
+        for h in headings:
+            indent = "  " * (h['level'] - 1)
+            result.append(f"  {indent}{'#' * h['level']} {h['text']} (L{h['line']})")
+    else:
+        result.append("  (no headings)")
+    return result
+
+
 @tool(
     description="""Get condensed outlines for multiple notes at once. Returns just headings (no links) to save space.
     Efficient for understanding structure of several related notes.""",
@@ -680,30 +1135,9 @@ def get_outlines(filepaths: str) -> str:
     result = [f"Outlines for {len(paths)} notes:"]
     result.append("=" * 60)
     
-    for filepath in paths:
-        try:
-            full_path = _resolve_vault_path(filepath)
-        except ValueError as e:
-            result.append(f"\n📄 {filepath}: Error - {e}")
-            continue
-        
-        if not full_path.exists():
-            result.append(f"\n📄 {filepath}: Not found")
-            continue
-        
-        with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        lines = content.split('\n')
-        headings = _extract_headings(content)
-        
-        result.append(f"\n📄 {filepath} ({len(lines)} lines)")
-        if headings:
-            for h in headings:
-                indent = "  " * (h['level'] - 1)
-                result.append(f"  {indent}{'#' * h['level']} {h['text']} (L{h['line']})")
-        else:
-            result.append("  (no headings)")
+    # Notes are parsed concurrently, the output keeps the order of filepaths
+    for lines in _map_parallel(_outline_lines, paths):
+        result.extend(lines)
     
     return '\n'.join(result)
 
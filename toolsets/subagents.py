@@ -1,20 +1,49 @@
 from ai_core.tools import tool, Tool, ToolCall, ToolResult
 from ai_core.client import AI
 from ai_core.types import Message, MessageContent
-import json
+from collections import OrderedDict
+from utils.json_utils import dumps
+import os
 import traceback
 from typing import List, Optional, Dict, Tuple
 from uuid import uuid4
-from .obsidian import read_note
+from .obsidian import read_note, _map_parallel
 
-# Store active conversations
-_conversations: Dict[str, AI] = {}
+# Store active conversations, least recently used first. Beyond _MAX_AGENTS
+# the oldest agent (and its message history) is dropped.
+_conversations: "OrderedDict[str, AI]" = OrderedDict()
+_MAX_AGENTS = 128
+
+def _get_agent(agent_id: str) -> Optional[AI]:
+    """Return the agent for agent_id, marking it as recently used"""
+    agent = _conversations.get(agent_id)
+    if agent is not None:
+        _conversations.move_to_end(agent_id)
+    return agent
+
+# Set SUBAGENT_DEBUG to include full tracebacks in tool errors
+_DEBUG = bool(os.environ.get("SUBAGENT_DEBUG"))
+
+# toolsets/__init__ imports this module before defining TOOL_SETS, so it is
+# looked up on first use and kept here
+_tool_sets: Optional[Dict[str, List[Tool]]] = None
+
+def _get_tool_sets() -> Dict[str, List[Tool]]:
+    """Return toolsets.TOOL_SETS, importing it on the first call only"""
+    global _tool_sets
+    if _tool_sets is None:
+        from . import TOOL_SETS
+        _tool_sets = TOOL_SETS
+    return _tool_sets
 
 def _handle_tool_calls(agent: AI, response: Message, tools: List[Tool]) -> Tuple[str, List[ToolCall], List[ToolResult]]:
     """Helper function to handle tool calls and create response loop"""
-    final_response = response.content
+    # Response texts are collected and joined once at the end
+    response_parts = [response.content]
     all_tool_calls = []
     all_tool_results = []
+    # Reversed so the first tool with a given name wins, as with a linear search
+    tools_by_name = {t.tool.name: t for t in reversed(tools)}
     
     while response.tool_calls:
         tool_results = []
@@ -33,7 +62,7 @@ def _handle_tool_calls(agent: AI, response: Message, tools: List[Tool]) -> Tuple
             all_tool_calls.append(tool_call)
             try:
                 # Find the matching tool
-                tool = next((t for t in tools if t.tool.name == tool_call.name), None)
+                tool = tools_by_name.get(tool_call.name)
                 if not tool:
                     raise ValueError(f"Tool {tool_call.name} not found")
                 
@@ -58,7 +87,8 @@ def _handle_tool_calls(agent: AI, response: Message, tools: List[Tool]) -> Tuple
                     name=tool_call.name,
                     result=None,
                     tool_call_id=tool_call.id,
-                    error=f"{str(e)}\n{traceback.format_exc()}"
+                    # Tracebacks are costly to format and rarely help the parent agent
+                    error=f"{str(e)}\n{traceback.format_exc()}" if _DEBUG else str(e)
                 )
             
             tool_results.append(tool_result)
@@ -76,9 +106,24 @@ def _handle_tool_calls(agent: AI, response: Message, tools: List[Tool]) -> Tuple
         # Get AI's response to tool results
         response = agent.messages(messages)
         if response.content:
-            final_response += "\n" + response.content
+            response_parts.append(response.content)
     
-    return final_response, all_tool_calls, all_tool_results
+    return "\n".join(response_parts), all_tool_calls, all_tool_results
+
+def _summarize_tool_calls(tool_calls: List[ToolCall], tool_results: List[ToolResult]) -> List[dict]:
+    """Pair each tool call with its result and error for the JSON response"""
+    # Reversed so the first result for an id wins, as with a linear search
+    results_by_id = {tr.tool_call_id: tr for tr in reversed(tool_results)}
+    summaries = []
+    for tc in tool_calls:
+        tr = results_by_id.get(tc.id)
+        summaries.append({
+            "name": tc.name,
+            "arguments": tc.arguments,
+            "result": tr.result if tr is not None else None,
+            "error": tr.error if tr is not None else None
+        })
+    return summaries
 
 @tool(
     description="Create a new AI subagent with specified configuration. This tool allows spawning a new AI instance "
@@ -118,16 +163,16 @@ def spawn_subagent(
     note_paths: str = ""
 ) -> str:
     """Creates a new AI subagent with the specified configuration"""
-    from . import TOOL_SETS
+    tool_sets = _get_tool_sets()
 
     # Parse and validate note paths
     note_context = []
     note_errors = []
     
     if note_paths:
-        for path in note_paths.split(','):
-            path = path.strip()
-            content = read_note(path)
+        paths = [path.strip() for path in note_paths.split(',')]
+        # Notes are read concurrently, contents come back in the order given
+        for path, content in zip(paths, _map_parallel(read_note, paths)):
             if content.startswith("Error:"):
                 note_errors.append(f"Failed to read note '{path}': {content}")
             else:
@@ -135,19 +180,19 @@ def spawn_subagent(
     
     # If any notes failed to load, return error
     if note_errors:
-        return json.dumps({
+        return dumps({
             "error": "Failed to load one or more notes:\n" + "\n".join(note_errors)
         })
     
     # Only add context block if we have notes
     if note_context:
-        system_prompt = (
-            f"OBSIDIAN CONTEXT BLOCK:\n"
-            f"<!-- Begin referenced notes -->\n"
-            f"{''.join(note_context)}\n"
-            f"<!-- End referenced notes -->\n\n"
-            f"{system_prompt}"
-        )
+        system_prompt = ''.join([
+            "OBSIDIAN CONTEXT BLOCK:\n",
+            "<!-- Begin referenced notes -->\n",
+            *note_context,
+            "\n<!-- End referenced notes -->\n\n",
+            system_prompt
+        ])
 
     # Parse comma-separated toolset names
     toolset_list = [name.strip() for name in toolset_names.split(",") if name.strip()]
@@ -155,8 +200,8 @@ def spawn_subagent(
     # Get tools from TOOL_SETS
     tools = []
     for toolset_name in toolset_list:
-        if toolset_name in TOOL_SETS:
-            tools.extend(TOOL_SETS[toolset_name])
+        if toolset_name in tool_sets:
+            tools.extend(tool_sets[toolset_name])
 
     # Create new AI instance
     agent = AI(
@@ -166,10 +211,12 @@ def spawn_subagent(
     )
     
     # Generate unique ID for this agent
-    agent_id = str(uuid4())
+    agent_id = uuid4().hex
     _conversations[agent_id] = agent
+    if len(_conversations) > _MAX_AGENTS:
+        _conversations.popitem(last=False)
     
-    return json.dumps({
+    return dumps({
         "agent_id": agent_id,
         "model": model_identifier,
         "tools": [t.tool.name for t in tools]  # Access name directly from Tool object
@@ -185,25 +232,18 @@ def spawn_subagent(
 )
 def prompt_subagent(agent_id: str, prompt: str) -> str:
     """Sends a one-time prompt to a subagent"""
-    if agent_id not in _conversations:
-        return json.dumps({"error": "Agent not found"})
+    agent = _get_agent(agent_id)
+    if agent is None:
+        return dumps({"error": "Agent not found"})
     
-    agent = _conversations[agent_id]
     response = agent.message(prompt)
     
     # Handle tool calls and get final response
     final_response, tool_calls, tool_results = _handle_tool_calls(agent, response, agent.tools)
     
-    return json.dumps({
+    return dumps({
         "response": final_response,
-        "tool_calls": [
-            {
-                "name": tc.name,
-                "arguments": tc.arguments,
-                "result": next((tr.result for tr in tool_results if tr.tool_call_id == tc.id), None),
-                "error": next((tr.error for tr in tool_results if tr.tool_call_id == tc.id), None)
-            } for tc in tool_calls
-        ]
+        "tool_calls": _summarize_tool_calls(tool_calls, tool_results)
     })
 
 @tool(
@@ -216,25 +256,18 @@ def prompt_subagent(agent_id: str, prompt: str) -> str:
 )
 def start_conversation(agent_id: str, initial_message: str) -> str:
     """Starts a new conversation with a subagent"""
-    if agent_id not in _conversations:
-        return json.dumps({"error": "Agent not found"})
+    agent = _get_agent(agent_id)
+    if agent is None:
+        return dumps({"error": "Agent not found"})
     
-    agent = _conversations[agent_id]
     response = agent.conversation(initial_message)
     
     # Handle tool calls and get final response
     final_response, tool_calls, tool_results = _handle_tool_calls(agent, response, agent.tools)
     
-    return json.dumps({
+    return dumps({
         "response": final_response,
-        "tool_calls": [
-            {
-                "name": tc.name,
-                "arguments": tc.arguments,
-                "result": next((tr.result for tr in tool_results if tr.tool_call_id == tc.id), None),
-                "error": next((tr.error for tr in tool_results if tr.tool_call_id == tc.id), None)
-            } for tc in tool_calls
-        ]
+        "tool_calls": _summarize_tool_calls(tool_calls, tool_results)
     })
 
 @tool(
@@ -246,25 +279,18 @@ def start_conversation(agent_id: str, initial_message: str) -> str:
 )
 def continue_conversation(agent_id: str, message: str) -> str:
     """Continues an existing conversation with a subagent"""
-    if agent_id not in _conversations:
-        return json.dumps({"error": "Agent not found"})
+    agent = _get_agent(agent_id)
+    if agent is None:
+        return dumps({"error": "Agent not found"})
     
-    agent = _conversations[agent_id]
     response = agent.conversation(message)
     
     # Handle tool calls and get final response
     final_response, tool_calls, tool_results = _handle_tool_calls(agent, response, agent.tools)
     
-    return json.dumps({
+    return dumps({
         "response": final_response,
-        "tool_calls": [
-            {
-                "name": tc.name,
-                "arguments": tc.arguments,
-                "result": next((tr.result for tr in tool_results if tr.tool_call_id == tc.id), None),
-                "error": next((tr.error for tr in tool_results if tr.tool_call_id == tc.id), None)
-            } for tc in tool_calls
-        ]
+        "tool_calls": _summarize_tool_calls(tool_calls, tool_results)
     })
 
 @tool(
@@ -274,7 +300,7 @@ def continue_conversation(agent_id: str, message: str) -> str:
 )
 def list_conversations() -> str:
     """Lists all active subagent conversations"""
-    return json.dumps({
+    return dumps({
         agent_id: {
             "model": agent.model_identifier,
             "tools": [t.tool.name for t in agent.tools]
@@ -1,18 +1,70 @@
+import codecs
+import heapq
+import io
 import os
+import queue
+import shlex
 import subprocess
 import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
 from ai_core.tools import tool
 import shutil
-import requests
 from integrations.html_to_markdown import HTMLToMarkdown
+from utils.json_utils import dumps, loads
 
-# Global mapping of session IDs to shell processes
+class _ShellSession(NamedTuple):
+    """
+    A shell process, the queue its reader thread fills with output, output read past the last sentinel,
+    and the tokens of sentinels still to come from startup or timed-out commands
+    """
+    process: subprocess.Popen
+    output: queue.Queue
+    leftover: list
+    stale_tokens: set
+
+# Marks the end of a command's output, followed by a per-command token
+_SENTINEL_PREFIX = "__SHELL_DONE_"
+
+# Characters that make run_command hand the command to the shell
+_SHELL_CHARS = frozenset('|&;<>()$`\\*?[]{}~#\n')
+
+# Global mapping of session IDs to shell sessions
 _shell_sessions = {}
 _session_last_activity = {}
+# Min-heap of (expiry time, session ID), one entry per session, rescheduled when it turns out to be stale
+_session_expiry_heap = []
+# Sessions idle for longer than this many seconds are terminated
+_SESSION_IDLE_LIMIT = 3600
+# Shell started for each persistent session
+_SHELL_COMMAND = ['cmd.exe', '/q'] if os.name == 'nt' else ['bash', '--login']
 _shell_lock = threading.Lock()
 
+# Reused across fetch_webpage calls so connections to a host stay open
+_html_to_md = HTMLToMarkdown()
+# Directories are trusted to exist for up to _DIR_TTL seconds after being created or
+# confirmed. The bound keeps a directory removed later from breaking writes for long.
+_DIR_TTL = 5
+
+# Concurrent requests made by fetch_webpages
+_FETCH_WORKERS = 8
+# Raw HTML beyond this many characters is cut off instead of being buffered whole
+_RAW_HTML_CHAR_LIMIT = 1_000_000
+
+def _ensure_parent_dir(path: str):
+    """Create the directories above path, skipping a bare filename and directories handled recently"""
+    directory = os.path.dirname(path)
+    if directory:
+        _ensure_dir_cached(directory, int(time.monotonic() // _DIR_TTL))
+
+@lru_cache(maxsize=1024)
+def _ensure_dir_cached(directory: str, epoch: int):
+    """Does the work of _ensure_parent_dir, once per directory within an epoch. Errors are not cached."""
+    os.makedirs(directory, exist_ok=True)
+
 @tool(
     description="Save a file to disk. Can optionally overwrite existing files, but this should be used with extreme caution.",
     path="The file path",
@@ -22,16 +74,15 @@ _shell_lock = threading.Lock()
 )
 def save_file(path: str, content: str, overwrite: bool = False) -> str:
     try:
-        # Check if file already exists
-        if os.path.exists(path) and not overwrite:
-            return f"Error: File {path} already exists. Cannot overwrite existing files unless overwrite=True."
-            
         # Create directories if they don't exist
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _ensure_parent_dir(path)
         
-        # Write the content to the file
-        with open(path, 'w', encoding='utf-8') as file:
-            file.write(content)
+        # Write the content to the file; 'x' mode refuses an existing file in the same call
+        try:
+            with open(path, 'w' if overwrite else 'x', encoding='utf-8') as file:
+                file.write(content)
+        except FileExistsError:
+            return f"Error: File {path} already exists. Cannot overwrite existing files unless overwrite=True."
             
         return f"File saved to {path}"
     except Exception as e:
@@ -46,7 +97,13 @@ def run_command(command: str) -> str:
     """Runs a command on the system, returns the output of the command"""
     try:
         # Use subprocess.run instead of os.system for better security and output capture
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        args = _split_simple_command(command)
+        result = subprocess.run(
+            command if args is None else args,
+            shell=args is None,
+            capture_output=True,
+            text=True
+        )
         
         # Combine stdout and stderr
         output = result.stdout
@@ -58,6 +115,22 @@ def run_command(command: str) -> str:
     except Exception as e:
         return f"Error executing command: {str(e)}"
 
+def _split_simple_command(command: str):
+    """
+    Splits a command that needs nothing from the shell into its arguments, so it can run without one.
+    Returns None when the shell is needed: shell syntax, a variable assignment,
+    a builtin or an unknown program (for the shell's own error message), or Windows.
+    """
+    if os.name == 'nt' or any(char in _SHELL_CHARS for char in command):
+        return None
+    try:
+        args = shlex.split(command)
+    except ValueError:
+        return None
+    if not args or '=' in args[0] or shutil.which(args[0]) is None:
+        return None
+    return args
+
 @tool(
     description="Read the contents of a file (limited to first 100,000 characters)",
     path="The file path",
@@ -65,10 +138,13 @@ def run_command(command: str) -> str:
 )
 def read_file(path: str) -> str:
     CHAR_LIMIT = 20_000  # About the size of a small book
-    with open(path, 'r', encoding='utf-8') as file:
-        content = file.read(CHAR_LIMIT)
-        if len(content) == CHAR_LIMIT:
-            content += "\n... (file truncated due to length)"
+    # UTF-8 needs at most 4 bytes per character, so this always covers CHAR_LIMIT characters
+    with open(path, 'rb') as file:
+        data = file.read(CHAR_LIMIT * 4)
+    # Same newline handling as a text-mode read
+    content = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')[:CHAR_LIMIT]
+    if len(content) == CHAR_LIMIT:
+        content += "\n... (file truncated due to length)"
     return content
 
 @tool(
@@ -77,7 +153,13 @@ def read_file(path: str) -> str:
     safe=True
 )
 def list_directory(path: str) -> str:
-    return os.listdir(path)
+    return dumps(os.listdir(path))
+
+# Agents often re-run the same snippet, so keep recent code objects around
+@lru_cache(maxsize=128)
+def _compile(code: str):
+    # Same filename exec() uses for source strings, so error messages are unchanged
+    return compile(code, '<string>', 'exec')
 
 @tool(
     description="Execute Python code. WARNING: This tool can be dangerous as it executes arbitrary Python code. Use with extreme caution.",
@@ -86,8 +168,6 @@ def list_directory(path: str) -> str:
 )
 def execute_python(code: str) -> str:
     """Executes Python code and returns the output"""
-    import io
-    import sys
     from contextlib import redirect_stdout, redirect_stderr
 
     try:
@@ -100,15 +180,15 @@ def execute_python(code: str) -> str:
         
         # Execute the code while capturing both stdout and stderr
         with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-            exec(code, {}, local_vars)
+            exec(_compile(code), {}, local_vars)
         
-        # Collect output
-        output = stdout_buffer.getvalue()
+        # Append any errors to the stdout buffer, so the result comes out of one
+        # getvalue() instead of concatenating the two outputs
         errors = stderr_buffer.getvalue()
-            
-        # Combine stdout and stderr if there are any
         if errors:
-            output += f"\nErrors:\n{errors}"
+            stdout_buffer.write("\nErrors:\n")
+            stdout_buffer.write(errors)
+        output = stdout_buffer.getvalue()
             
         return output if output else "Code executed successfully with no output"
         
@@ -125,23 +205,41 @@ def execute_python(code: str) -> str:
 )
 def copy_file(source: str, destination: str, move: bool = False, overwrite: bool = False) -> str:
     try:
-        # Check if source exists
-        if not os.path.exists(source):
+        # Check if source exists, keeping its device for the move below
+        try:
+            source_dev = os.stat(source).st_dev
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: Source file {source} does not exist."
             
-        # Check if destination already exists
-        if os.path.exists(destination) and not overwrite:
-            return f"Error: Destination file {destination} already exists. Cannot overwrite existing files unless overwrite=True."
+        exists_error = f"Error: Destination file {destination} already exists. Cannot overwrite existing files unless overwrite=True."
             
         # Create destination directories if they don't exist
-        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        _ensure_parent_dir(destination)
         
         # Perform the copy or move operation
         if move:
-            shutil.move(source, destination)
+            # Check if destination already exists
+            if os.path.exists(destination) and not overwrite:
+                return exists_error
+            # On one filesystem a move is a single rename, which also replaces an existing file on Windows
+            if os.stat(os.path.dirname(destination) or '.').st_dev == source_dev and not os.path.isdir(destination):
+                os.replace(source, destination)
+            else:
+                shutil.move(source, destination)
             return f"File moved from {source} to {destination}"
         else:
-            shutil.copy2(source, destination)  # copy2 preserves metadata
+            if not overwrite:
+                # Claim the destination name atomically, copy2 then fills the empty file
+                try:
+                    open(destination, 'xb').close()
+                except FileExistsError:
+                    return exists_error
+            try:
+                shutil.copy2(source, destination)  # copy2 preserves metadata
+            except Exception:
+                if not overwrite:
+                    os.remove(destination)
+                raise
             return f"File copied from {source} to {destination}"
             
     except Exception as e:
@@ -157,20 +255,49 @@ def fetch_webpage(url: str, raw_html: bool = False) -> str:
     """Fetches content from a URL and returns it as markdown or raw HTML"""
     try:
         if raw_html:
-            # Make the request to get the webpage content
-            response = requests.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            })
-            response.raise_for_status()
-            return response.text
+            # Stream the webpage content on the converter's pooled session, stopping at the size limit
+            with _html_to_md.session.get(url, headers=_html_to_md.headers, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = 'utf-8'
+                chunks = []
+                total = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total > _RAW_HTML_CHAR_LIMIT:
+                        return ''.join(chunks)[:_RAW_HTML_CHAR_LIMIT] + "\n... (page truncated due to length)"
+            return ''.join(chunks)
             
         # Convert to markdown using the HTMLToMarkdown integration
-        converter = HTMLToMarkdown()
-        return converter.convert_url(url)
+        return _html_to_md.convert_url(url)
         
     except Exception as e:
         return f"Error fetching webpage: {str(e)}"
 
+@tool(
+    description="Fetch several webpages at once, each converted to markdown or returned as raw HTML. Returns a JSON array of {url, content} objects in the order of the URLs",
+    urls="JSON array of URLs to fetch (e.g., '[\"https://example.com\", \"https://example.org\"]')",
+    raw_html="Whether to return the raw HTML instead of converting to markdown (defaults to False)",
+    safe=True
+)
+def fetch_webpages(urls: str, raw_html: bool = False) -> str:
+    """Fetches several URLs concurrently, sharing fetch_webpage's connection pool"""
+    try:
+        url_list = loads(urls)
+    except Exception as e:
+        return f"Error: Invalid JSON for urls: {str(e)}"
+    if not isinstance(url_list, list) or not all(isinstance(url, str) for url in url_list):
+        return "Error: urls must be a JSON array of strings"
+    
+    def fetch_one(url):
+        return {"url": url, "content": fetch_webpage(url, raw_html)}
+    
+    # The requests overlap their network waits, results keep the order of the URLs
+    with ThreadPoolExecutor(max_workers=max(1, min(_FETCH_WORKERS, len(url_list)))) as executor:
+        results = list(executor.map(fetch_one, url_list))
+    return dumps(results)
+
 @tool(
     description="Run a command in a persistent shell session that maintains state between calls. Returns a session_id when first called. For subsequent commands, provide the same session_id to maintain shell state (directory, environment variables, etc.).",
     command="The command to run",
@@ -193,24 +320,28 @@ def persistent_shell(command: str, session_id: str = "", timeout: int = 30) -> s
         if is_new_session:
             session_id = str(uuid.uuid4())
             
-            # For Windows
-            startup_info = None
-            if os.name == 'nt':
-                shell_command = ['cmd.exe', '/q']
-            else:  # Unix/Linux
-                shell_command = ['bash', '--login']
-                
             process = subprocess.Popen(
-                shell_command,
+                _SHELL_COMMAND,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                startupinfo=startup_info
+                errors='replace'
             )
             
-            _shell_sessions[session_id] = process
+            # One daemon thread per session moves the shell's output into a queue
+            session = _ShellSession(process, queue.Queue(), [], set())
+            threading.Thread(target=_pump_output, args=(process.stdout, session.output), daemon=True).start()
+            # Anything printed at startup (login scripts) comes before this sentinel
+            # and is dropped by the first command
+            startup_token = uuid.uuid4().hex
+            session.stale_tokens.add(startup_token)
+            process.stdin.write(f"echo {_SENTINEL_PREFIX}{startup_token}__\n")
+            process.stdin.flush()
+            
+            _shell_sessions[session_id] = session
             _session_last_activity[session_id] = time.time()
+            heapq.heappush(_session_expiry_heap, (_session_last_activity[session_id] + _SESSION_IDLE_LIMIT, session_id))
             
             # If no command was provided, just return the session info
             if not command or command.strip() == "":
@@ -222,10 +353,10 @@ def persistent_shell(command: str, session_id: str = "", timeout: int = 30) -> s
             if session_id not in _shell_sessions:
                 return f"Error: Session {session_id} not found or has expired. Please create a new session."
             
-            process = _shell_sessions[session_id]
+            session = _shell_sessions[session_id]
             
             # Check if process is still alive
-            if process.poll() is not None:
+            if session.process.poll() is not None:
                 del _shell_sessions[session_id]
                 return f"Error: Shell process has exited. Please create a new session."
         
@@ -233,69 +364,26 @@ def persistent_shell(command: str, session_id: str = "", timeout: int = 30) -> s
             # Update last activity time
             _session_last_activity[session_id] = time.time()
             
-            # Create a command file that outputs the result to a temporary file
-            # This avoids issues with reading from pipes
-            temp_dir = os.environ.get('TEMP', '/tmp') if os.name == 'nt' else '/tmp'
-            output_file = os.path.join(temp_dir, f"shell_output_{session_id}.txt")
-            done_file = os.path.join(temp_dir, f"shell_output_{session_id}.done")
-            
-            # Clear any previous output file
-            if os.path.exists(output_file):
-                try:
-                    os.remove(output_file)
-                except:
-                    pass
-            if os.path.exists(done_file):
-                try:
-                    os.remove(done_file)
-                except:
-                    pass
-            
-            if os.name == 'nt':  # Windows
-                full_command = f"{command} > \"{output_file}\" 2>&1 & echo Done > \"{done_file}\"\n"
-            else:  # Unix
-                full_command = f"{command} > \"{output_file}\" 2>&1; echo Done > \"{done_file}\"\n"
+            # The shell echoes a unique sentinel once the command has finished, so
+            # its output can be read straight from the pipe
+            token = uuid.uuid4().hex
+            full_command = f"{command}\necho {_SENTINEL_PREFIX}{token}__\n"
             
             # Send command to the shell
-            process.stdin.write(full_command)
-            process.stdin.flush()
+            session.process.stdin.write(full_command)
+            session.process.stdin.flush()
             
             # Wait for command to complete with timeout
             start_time = time.time()
-            output = ""
-            
-            while time.time() - start_time < timeout:
-                # Check for done file
-                if os.path.exists(done_file):
-                    break
-                
-                # Check if process died
-                if process.poll() is not None:
-                    if session_id in _shell_sessions:
-                        del _shell_sessions[session_id]
-                    return f"Error: Shell process exited unexpectedly. Please create a new session."
-                
-                time.sleep(0.1)
+            output, status = _collect_output(session, token, timeout)
             
-            # Read the output file
-            if os.path.exists(output_file):
-                try:
-                    with open(output_file, 'r', encoding='utf-8', errors='replace') as f:
-                        output = f.read()
-                except Exception as e:
-                    output = f"Error reading output file: {str(e)}"
-            
-            # Clean up temporary files
-            try:
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-                if os.path.exists(done_file):
-                    os.remove(done_file)
-            except:
-                pass  # Ignore cleanup errors
+            if status == "exited":
+                if session_id in _shell_sessions:
+                    del _shell_sessions[session_id]
+                return f"Error: Shell process exited unexpectedly. Please create a new session."
             
             # If we've timed out
-            if time.time() - start_time >= timeout:
+            if status == "timeout":
                 output += "\n[Command timed out after {} seconds]".format(timeout)
             
             # Update activity time again
@@ -304,18 +392,18 @@ def persistent_shell(command: str, session_id: str = "", timeout: int = 30) -> s
             # Clean up old sessions
             _cleanup_old_sessions()
             
+            result = output.strip() if output else "Command completed with no output"
+            
             # For new sessions, include the session ID in the result
             if is_new_session:
-                prefix = f"Created new shell session with ID: {session_id}\n\n"
-                return f"{prefix}{output.strip() if output else f'{prefix}Command completed with no output'}"
-            else:
-                return output.strip() if output else "Command completed with no output"
+                return f"Created new shell session with ID: {session_id}\n\n{result}"
+            return result
             
         except Exception as e:
             # If process had an error, clean it up
             if session_id in _shell_sessions:
                 try:
-                    _shell_sessions[session_id].terminate()
+                    _shell_sessions[session_id].process.terminate()
                 except:
                     pass
                 del _shell_sessions[session_id]
@@ -324,27 +412,109 @@ def persistent_shell(command: str, session_id: str = "", timeout: int = 30) -> s
             
             return f"Error executing command: {str(e)}"
 
-def _read_until_prompt(process, timeout):
+def _pump_output(stream, output_queue):
     """
-    This function is no longer used in the file-based implementation.
-    Kept for backward compatibility.
+    Reader thread body: forwards a shell's output, then None once the shell exits.
+    Each pipe read is queued as one string of complete lines rather than line by line.
     """
-    return ""
+    # Unbuffered file under the text-mode pipe, readinto works on it on every platform
+    raw = stream.buffer.raw
+    # Same decoding and newline translation as the text-mode pipe
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(stream.encoding)(errors='replace'), translate=True)
+    # One buffer for the life of the session, reads land in it instead of in a new bytes object each time
+    buffer = bytearray(65536)
+    view = memoryview(buffer)
+    partial = ''
+    while True:
+        try:
+            size = raw.readinto(view) or 0
+        except OSError:
+            # A pipe broken by the shell exiting is the end of its output
+            size = 0
+        text = partial + decoder.decode(view[:size], final=not size)
+        if not size:
+            break
+        end = text.rfind('\n') + 1
+        partial = text[end:]
+        if end:
+            output_queue.put(text[:end])
+    if text:
+        output_queue.put(text)
+    output_queue.put(None)
+
+def _collect_output(session, token, timeout):
+    """
+    Gathers a command's output up to its sentinel line.
+    Returns (output, status) where status is "done", "timeout" or "exited".
+    """
+    deadline = time.monotonic() + timeout
+    parts = []
+    while True:
+        if session.leftover:
+            text = session.leftover.pop()
+        else:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                text = session.output.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if text is None:
+                return ''.join(parts), "exited"
+        
+        # A batch can hold stale sentinels before ours, and output after it
+        search_from = 0
+        while True:
+            index = text.find(_SENTINEL_PREFIX, search_from)
+            if index < 0:
+                parts.append(text)
+                break
+            line_end = text.find('\n', index) + 1 or len(text)
+            # Output without a trailing newline shares the sentinel's line, so only the
+            # rest of the line has to be a sentinel this session issued
+            found = text[index + len(_SENTINEL_PREFIX):line_end].rstrip('\n')[:-2]
+            if found == token:
+                parts.append(text[:index])
+                # Anything after it (background jobs) belongs to the next command
+                if line_end < len(text):
+                    session.leftover.append(text[line_end:])
+                return ''.join(parts), "done"
+            if found in session.stale_tokens:
+                # Sentinel of startup or of a command that timed out: what came before it is not ours
+                session.stale_tokens.discard(found)
+                parts.clear()
+                text = text[line_end:]
+                search_from = 0
+            else:
+                # The prefix is part of the command's own output
+                search_from = index + len(_SENTINEL_PREFIX)
+    
+    # Our sentinel is still to come, the next command drops everything up to it
+    session.stale_tokens.add(token)
+    return ''.join(parts), "timeout"
 
 def _cleanup_old_sessions():
     """Cleans up sessions that have been idle for more than 1 hour"""
     current_time = time.time()
-    idle_limit = 3600  # 1 hour in seconds
     
-    for session_id in list(_session_last_activity.keys()):
-        if current_time - _session_last_activity[session_id] > idle_limit:
+    # Only sessions whose earliest possible expiry has passed are looked at
+    while _session_expiry_heap and _session_expiry_heap[0][0] < current_time:
+        _, session_id = heapq.heappop(_session_expiry_heap)
+        last_activity = _session_last_activity.get(session_id)
+        if last_activity is None:
+            continue
+        if current_time - last_activity <= _SESSION_IDLE_LIMIT:
+            # Used since it was scheduled, check again when the new idle period runs out
+            heapq.heappush(_session_expiry_heap, (last_activity + _SESSION_IDLE_LIMIT, session_id))
+        else:
             if session_id in _shell_sessions:
                 try:
-                    _shell_sessions[session_id].terminate()
+                    _shell_sessions[session_id].process.terminate()
                 except:
                     pass
                 del _shell_sessions[session_id]
             del _session_last_activity[session_id]
 
 # Export the tools in this toolset
-TOOLS = [save_file, run_command, read_file, list_directory, execute_python, copy_file, fetch_webpage, persistent_shell] 
\ No newline at end of file
+TOOLS = [save_file, run_command, read_file, list_directory, execute_python, copy_file, fetch_webpage, fetch_webpages, persistent_shell] 
\ No newline at end of file
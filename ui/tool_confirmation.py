@@ -1,10 +1,11 @@
 from PyQt5.QtWidgets import QApplication, QMessageBox, QTextEdit, QSizePolicy, QVBoxLayout, QWidget, QLabel, QDialogButtonBox, QDialog, QFrame
-from PyQt5.QtCore import Qt
-from typing import Dict, Any, Tuple
+from PyQt5.QtCore import Qt, QEvent
+from typing import Dict, Any, List, Tuple
 from ai_core.tools import Tool
 import json
 import codecs
 import sys
+import time
 
 def format_argument_value(param_type: str, value: Any) -> str:
     """
@@ -21,6 +22,10 @@ def format_argument_value(param_type: str, value: Any) -> str:
         return "None"
     
     if param_type == "string" and isinstance(value, str):
+        # Without a backslash there is no escape to render and the round-trip
+        # below returns the string unchanged
+        if '\\' not in value:
+            return value
         try:
             # First try to encode the string as raw string to handle escapes
             raw_str = str(value).encode('raw_unicode_escape')
@@ -31,9 +36,85 @@ def format_argument_value(param_type: str, value: Any) -> str:
             return value
     return str(value)
 
+# Values shorter than this, on one line, are shown in a QLabel instead of a QTextEdit
+_SHORT_VALUE_CHARS = 200
+
+class ArgumentFrame(QFrame):
+    """Framed display of a single argument, refilled in place when reused"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setFrameStyle(QFrame.Panel | QFrame.Raised)
+        self.setLineWidth(1)
+        self.setMinimumWidth(600)  # Set minimum width for the frame
+        
+        layout = QVBoxLayout()
+        
+        # Header with name and type
+        self.header = QLabel()
+        self.header.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.header)
+        
+        # Description, hidden when the parameter has none
+        self.desc_label = QLabel()
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setStyleSheet("color: gray; font-style: italic;")
+        layout.addWidget(self.desc_label)
+        
+        # Short single-line values are shown in a label, the rest in a text area
+        self.value_label = QLabel()
+        self.value_label.setTextFormat(Qt.PlainText)
+        self.value_label.setWordWrap(True)
+        self.value_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.value_label)
+        
+        # Value text area
+        self.value_text = QTextEdit()
+        self.value_text.setReadOnly(True)
+        self.value_text.setMinimumWidth(580)  # Set minimum width for the text area
+        layout.addWidget(self.value_text)
+        
+        self.setLayout(layout)
+    
+    def set_argument(self, name: str, value: Any, param_type: str, description: str):
+        self.header.setText(f"{name} ({param_type})")
+        self.desc_label.setText(description or "")
+        self.desc_label.setVisible(bool(description))
+        text = format_argument_value(param_type, value)
+        is_short = len(text) < _SHORT_VALUE_CHARS and '\n' not in text
+        self.value_label.setVisible(is_short)
+        self.value_text.setVisible(not is_short)
+        if is_short:
+            self.value_label.setText(text)
+            # Drop the previous long value rather than keeping it alive in the pool
+            self.value_text.clear()
+            return
+        self.value_label.clear()
+        self.value_text.setPlainText(text)
+        
+        # Adjust height based on content, estimated from line count and wrapping
+        # rather than laying out the whole document
+        metrics = self.value_text.fontMetrics()
+        chars_per_line = max(1, 580 // max(1, metrics.averageCharWidth()))
+        line_count = max(text.count('\n') + 1, len(text) // chars_per_line)
+        doc_height = int(line_count * metrics.lineSpacing() + 2 * self.value_text.document().documentMargin())
+        self.value_text.setMinimumHeight(min(max(60, doc_height + 20), 200))
+
+# Argument frames from earlier dialogs, detached before the dialog is deleted
+_arg_widget_pool: List[ArgumentFrame] = []
+_app = None
+
+def _get_app() -> QApplication:
+    """Return the QApplication, creating it on first use"""
+    global _app
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
 def create_argument_widget(name: str, value: Any, param_type: str, description: str) -> QFrame:
     """
     Create a framed widget for displaying a single argument.
+    Reuses a pooled frame when one is available.
     
     Args:
         name: Argument name
@@ -44,37 +125,8 @@ def create_argument_widget(name: str, value: Any, param_type: str, description:
     Returns:
         QFrame containing the argument display
     """
-    frame = QFrame()
-    frame.setFrameStyle(QFrame.Panel | QFrame.Raised)
-    frame.setLineWidth(1)
-    frame.setMinimumWidth(600)  # Set minimum width for the frame
-    
-    layout = QVBoxLayout()
-    
-    # Create header with name and type
-    header = QLabel(f"{name} ({param_type})")
-    header.setStyleSheet("font-weight: bold;")
-    layout.addWidget(header)
-    
-    # Add description
-    if description:
-        desc_label = QLabel(description)
-        desc_label.setWordWrap(True)
-        desc_label.setStyleSheet("color: gray; font-style: italic;")
-        layout.addWidget(desc_label)
-    
-    # Add value text area
-    value_text = QTextEdit()
-    value_text.setPlainText(format_argument_value(param_type, value))
-    value_text.setReadOnly(True)
-    value_text.setMinimumWidth(580)  # Set minimum width for the text area
-    
-    # Adjust height based on content
-    doc_height = value_text.document().size().height()
-    value_text.setMinimumHeight(min(max(60, doc_height + 20), 200))
-    
-    layout.addWidget(value_text)
-    frame.setLayout(layout)
+    frame = _arg_widget_pool.pop() if _arg_widget_pool else ArgumentFrame()
+    frame.set_argument(name, value, param_type, description)
     return frame
 
 def confirm_tool_execution(tool: Tool, arguments: Dict[str, Any]) -> Tuple[bool, str]:
@@ -88,12 +140,7 @@ def confirm_tool_execution(tool: Tool, arguments: Dict[str, Any]) -> Tuple[bool,
     Returns:
         Tuple[bool, str]: (True if user confirms, False otherwise, Optional message to AI)
     """
-    import time
-    
-    # Get the existing QApplication instance
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    app = _get_app()
     
     # Store result in a mutable container to capture from signal handler
     result_container = {'done': False, 'confirmed': False, 'user_message': ''}
@@ -119,6 +166,7 @@ def confirm_tool_execution(tool: Tool, arguments: Dict[str, Any]) -> Tuple[bool,
     layout.addWidget(args_label)
     
     # Add each argument in its own frame
+    arg_widgets = []
     for arg_name, arg_value in arguments.items():
         param_info = tool.parameters.get(arg_name)
         if param_info:
@@ -129,6 +177,7 @@ def confirm_tool_execution(tool: Tool, arguments: Dict[str, Any]) -> Tuple[bool,
                 param_info.description
             )
             layout.addWidget(arg_widget)
+            arg_widgets.append(arg_widget)
     
     # Add message to AI field
     message_label = QLabel("Optional message to AI:")
@@ -176,6 +225,13 @@ def confirm_tool_execution(tool: Tool, arguments: Dict[str, Any]) -> Tuple[bool,
     # This is important because after we return, Qt events may not be processed
     # for a long time (during AI API calls, tool execution, etc.)
     dialog.hide()  # Hide immediately
+    
+    # Take the argument frames back out so deleting the dialog does not delete them
+    for arg_widget in arg_widgets:
+        layout.removeWidget(arg_widget)
+        arg_widget.setParent(None)
+        _arg_widget_pool.append(arg_widget)
+    
     dialog.close()  # Send close event
     app.processEvents()  # Process the hide/close
     
@@ -184,10 +240,10 @@ def confirm_tool_execution(tool: Tool, arguments: Dict[str, Any]) -> Tuple[bool,
     
     dialog.deleteLater()  # Schedule Python-side cleanup
     
-    # Process events repeatedly to ensure all cleanup is done
-    for _ in range(10):
-        app.processEvents()
-        time.sleep(0.01)
+    # Run the scheduled deletion now, scoped to the dialog, instead of spinning
+    # the whole event loop until it happens to get there
+    QApplication.sendPostedEvents(dialog, QEvent.DeferredDelete)
+    app.processEvents()  # Process what the deletion posted
     
     return (result_container['confirmed'], result_container['user_message'])
 
@@ -0,0 +1,46 @@
+"""JSON helpers for tool return values, backed by orjson when it is installed."""
+
+from typing import Any, List, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    import json
+    HAS_ORJSON = False
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string, non-ASCII characters unescaped."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    # Same output shape as orjson
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps_list(items: List[Any], chunk_size: int = 100) -> str:
+    """Serialize a large list chunk by chunk into one buffer.
+
+    Skips the full-size bytes copy that dumps() decodes from. Lists of up to
+    two chunks are not worth it and go through dumps().
+    """
+    if not HAS_ORJSON or len(items) <= 2 * chunk_size:
+        return dumps(items)
+    buf = bytearray(b'[')
+    for start in range(0, len(items), chunk_size):
+        if start:
+            buf += b','
+        # Strip the brackets so the chunks splice into one array
+        buf += orjson.dumps(items[start:start + chunk_size])[1:-1]
+    buf += b']'
+    return buf.decode()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from a string or bytes.
+
+    Raises json.JSONDecodeError on invalid input (orjson's error subclasses it).
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
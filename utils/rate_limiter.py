@@ -1,18 +1,102 @@
 """Rate limiting utility for API calls and message sending."""
 
+import atexit
 import json
+import os
+import threading
 import time
 import logging
-from datetime import datetime, date, time as dt_time
-from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from datetime import datetime, date, timedelta, timezone, time as dt_time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
 from config.paths import PATHS
 from config.logging_config import setup_logger
+from utils.json_utils import dumps
 import random
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 logger = setup_logger(__name__)
 
+# The daily quota counts operations over this many trailing minutes, in one-minute buckets
+WINDOW_MINUTES = 24 * 60
+
+# (remaining, limit) response headers that ReactiveRateLimiter.record_response checks, lowercase
+RATE_LIMIT_HEADER_PAIRS = (
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-limit"),
+    ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-limit"),
+    ("x-ratelimit-remaining-requests", "x-ratelimit-limit-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-limit-tokens"),
+)
+# Below this fraction of the quota left, record_response starts backing off
+LOW_REMAINING_FRACTION = 0.1
+
+# Longest time wait() trusts the monotonic clock before re-reading the wall clock for night mode,
+# so wall-clock changes (DST, manual adjustments) are noticed within this many seconds
+NIGHT_CHECK_MAX_SECONDS = 3600
+
+# RateLimiter logs a summary of its stats at most this often, instead of a line per wait
+STATS_LOG_INTERVAL_SECONDS = 30.0
+
+# Waits shorter than this are skipped: sleep() overshoots by about as much
+MIN_SLEEP_SECONDS = 500e-6
+
+def _lock_file(f):
+    """Block until this process holds an exclusive lock on the open file f."""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+def _unlock_file(f):
+    """Release a lock taken with _lock_file."""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _parse_rate_limit_data(stored_data: Dict[str, Any]):
+    """Return the [minute, count] buckets and last operation time from a saved rate limit file."""
+    buckets = stored_data.get("recent_operations")
+    if buckets is None:
+        # Saved by the per-day counter: today's operations go in the bucket of the last one
+        buckets = []
+        last_time = stored_data.get("last_operation_time")
+        if stored_data.get("date") == str(date.today()) and stored_data["operations_count"] and last_time:
+            buckets = [[int(last_time // 60), stored_data["operations_count"]]]
+    return [[int(minute), int(count)] for minute, count in buckets], stored_data.get("last_operation_time")
+
 class RateLimiter:
+    __slots__ = (
+        "name", "min_delay", "max_delay", "max_per_day", "night_mode", "backoff_factor",
+        "max_backoff_seconds", "consecutive_failures", "current_backoff",
+        "night_start", "morning_start", "morning_end", "_night_check_after",
+        "rate_limit_dir", "rate_limit_file", "rate_limit_data", "_buckets",
+        "_dirty", "_ops_since_flush", "_last_flush", "_flush_interval", "_flush_every",
+        "_pending", "_data_lock", "_synced_content",
+        "_next_slot", "_slot_lock", "_cancel", "_last_op_mono", "_initialized",
+        "_stats", "_stats_logged",
+    )
+    
+    # One shared instance per name, so limiters with the same name count against the same quota
+    _registry: Dict[str, "RateLimiter"] = {}
+    _registry_lock = threading.Lock()
+    
+    def __new__(cls, name: str, *args, **kwargs):
+        with cls._registry_lock:
+            instance = cls._registry.get(name)
+            if instance is None:
+                instance = super().__new__(cls)
+                cls._registry[name] = instance
+            return instance
+    
     def __init__(self, 
                  name: str,
                  min_delay_seconds: float = 2.0,
@@ -23,15 +107,22 @@ class RateLimiter:
                  max_backoff_seconds: float = 300.0):  # 5 minutes max backoff
         """Initialize rate limiter with configurable parameters.
         
+        Creating a RateLimiter with the name of an existing one returns that instance
+        unchanged: the other arguments only apply the first time a name is used.
+        
         Args:
             name: Unique name for this rate limiter (used for persistent storage)
             min_delay_seconds: Minimum delay between operations
             max_delay_seconds: Maximum delay between operations (for jitter)
-            max_per_day: Maximum number of operations per day
+            max_per_day: Maximum number of operations in any 24 hour window
             night_mode: Whether to pause operations during night hours
             backoff_factor: Multiplier for exponential backoff on failures
             max_backoff_seconds: Maximum backoff delay in seconds
         """
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        
         self.name = name
         self.min_delay = min_delay_seconds
         self.max_delay = max_delay_seconds
@@ -48,74 +139,201 @@ class RateLimiter:
         self.night_start = dt_time(hour=0, minute=30)  # 12:30 AM (00:30)
         self.morning_start = dt_time(hour=7, minute=30)  # 7:30 AM
         self.morning_end = dt_time(hour=8, minute=0)    # 8:00 AM
+        # Monotonic time before which wait() knows it's daytime without reading the wall clock
+        self._night_check_after = 0.0
         
         # Create rate limit directory if it doesn't exist
         self.rate_limit_dir = PATHS.data / "rate_limits"
         self.rate_limit_dir.mkdir(parents=True, exist_ok=True)
         
+        # Successes are saved in batches: after _flush_every unsaved operations,
+        # or on the first one more than _flush_interval seconds after the last save
+        self._dirty = False
+        self._ops_since_flush = 0
+        self._last_flush = time.monotonic()
+        self._flush_interval = 5.0
+        self._flush_every = 20
+        # Operations not yet saved, by minute. Saves add them to whatever the file holds,
+        # so other processes sharing the file don't overwrite each other's counts.
+        self._pending: Dict[int, int] = {}
+        self._data_lock = threading.RLock()
+        # File contents as of the last load or save: while the file still holds exactly
+        # this, our buckets are its operations plus _pending and it needn't be parsed again
+        self._synced_content: Optional[str] = None
+        
+        # Monotonic time from which the next wait() caller may proceed
+        self._next_slot = 0.0
+        self._slot_lock = threading.Lock()
+        
+        # Set by cancel() to wake every sleeping wait() caller
+        self._cancel = threading.Event()
+        
+        # Running totals since this limiter was created, see get_stats()
+        self._stats = {"waits": 0, "wait_seconds": 0.0, "successes": 0, "failures": 0}
+        self._stats_logged = time.monotonic()
+        
         # Initialize rate limiting from persistent storage
         self._init_rate_limiting()
+        
+        # Don't lose the unsaved tail of a batch on a normal exit
+        atexit.register(self.close)
     
     def _init_rate_limiting(self):
         """Initialize rate limiting data from persistent storage."""
         self.rate_limit_file = self.rate_limit_dir / f"{self.name}_rate_limit.json"
         
-        # Default rate limit data
+        # Default rate limit data. operations_count is the total of the buckets in the window.
         self.rate_limit_data = {
-            "date": str(date.today()),
             "operations_count": 0,
             "last_operation_time": None
         }
+        # [minute, count] buckets of successful operations over the last 24 hours, oldest first
+        self._buckets = deque()
         
         # Load existing data if available
         if self.rate_limit_file.exists():
             try:
-                with open(self.rate_limit_file, 'r') as f:
-                    stored_data = json.load(f)
+                with open(self.rate_limit_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
                 
-                # Reset counter if it's a new day
-                if stored_data["date"] == str(date.today()):
-                    self.rate_limit_data = stored_data
-                else:
-                    # It's a new day, save default data
-                    self._save_rate_limit_data()
+                buckets, last_time = _parse_rate_limit_data(json.loads(content))
+                self._buckets = deque(buckets)
+                self.rate_limit_data = {
+                    "operations_count": sum(count for _, count in self._buckets),
+                    "last_operation_time": last_time
+                }
+                self._expire_operations()
+                self._synced_content = content
             except Exception as e:
-                logger.error(f"Error loading rate limit data: {e}")
+                logger.error("Error loading rate limit data: %s", e)
                 # Use default data and save it
                 self._save_rate_limit_data()
         else:
             # No existing data, save default data
             self._save_rate_limit_data()
+        
+        # Throttling runs on the monotonic clock, the stored wall-clock time only seeds it
+        last_time = self.rate_limit_data["last_operation_time"]
+        self._last_op_mono = None if last_time is None else time.monotonic() - max(0.0, time.time() - last_time)
     
     def _save_rate_limit_data(self):
-        """Save rate limiting data to persistent storage."""
-        try:
-            with open(self.rate_limit_file, 'w') as f:
-                json.dump(self.rate_limit_data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving rate limit data: {e}")
+        """Save rate limiting data to persistent storage.
+        
+        The unsaved operations are added to the operations in the file under an exclusive
+        lock, and the merged result becomes this limiter's state, so the count includes
+        the operations of other processes using the same file. The file is replaced
+        atomically, so a crash mid-save leaves the previous version intact.
+        """
+        with self._data_lock:
+            self._dirty = False
+            self._ops_since_flush = 0
+            self._last_flush = time.monotonic()
+            try:
+                # Lock a separate file: the data file is replaced, so a lock on it wouldn't hold
+                with open(f"{self.rate_limit_file}.lock", 'a') as lock:
+                    _lock_file(lock)
+                    try:
+                        try:
+                            content = self.rate_limit_file.read_text(encoding='utf-8')
+                        except FileNotFoundError:
+                            content = None
+                        if content == self._synced_content:
+                            # No other process has saved since we last did
+                            stored_buckets, stored_last_time = list(self._buckets), None
+                            self._pending = {}
+                        else:
+                            try:
+                                stored_buckets, stored_last_time = _parse_rate_limit_data(json.loads(content))
+                            except Exception:
+                                # New or unreadable file: our own state is all there is
+                                stored_buckets, stored_last_time = list(self._buckets), None
+                                self._pending = {}
+                        
+                        counts = dict(stored_buckets)
+                        for minute, count in self._pending.items():
+                            counts[minute] = counts.get(minute, 0) + count
+                        self._buckets = deque([minute, counts[minute]] for minute in sorted(counts))
+                        self.rate_limit_data["operations_count"] = sum(counts.values())
+                        last_times = [t for t in (stored_last_time, self.rate_limit_data["last_operation_time"]) if t is not None]
+                        self.rate_limit_data["last_operation_time"] = max(last_times, default=None)
+                        self._expire_operations()
+                        
+                        content = dumps({**self.rate_limit_data, "recent_operations": list(self._buckets)})
+                        tmp_file = f"{self.rate_limit_file}.tmp"
+                        with open(tmp_file, 'w', encoding='utf-8') as f:
+                            f.write(content)
+                        os.replace(tmp_file, self.rate_limit_file)
+                        # Only now are the pending operations in the file; if the save failed,
+                        # the next one merges them again
+                        self._pending = {}
+                        self._synced_content = content
+                    finally:
+                        _unlock_file(lock)
+            except Exception as e:
+                logger.error("Error saving rate limit data: %s", e)
+    
+    def _expire_operations(self):
+        """Drop the buckets that have left the 24 hour window."""
+        oldest_minute = int(time.time() // 60) - WINDOW_MINUTES
+        while self._buckets and self._buckets[0][0] <= oldest_minute:
+            self.rate_limit_data["operations_count"] -= self._buckets.popleft()[1]
+    
+    def _maybe_flush(self):
+        """Save pending changes once enough operations or time have accumulated."""
+        if (self._ops_since_flush >= self._flush_every
+                or time.monotonic() - self._last_flush > self._flush_interval):
+            self._save_rate_limit_data()
     
-    def _is_night_time(self) -> bool:
-        """Check if current time is during night hours."""
-        current_time = datetime.now().time()
+    def close(self):
+        """Save any changes not yet written to persistent storage."""
+        if self._dirty:
+            self._save_rate_limit_data()
+    
+    def cancel(self):
+        """Wake any thread sleeping in wait() and make this and later waits return False."""
+        self._cancel.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of waits, seconds spent waiting, successes and failures so far."""
+        return dict(self._stats)
+    
+    def _maybe_log_stats(self, now: float):
+        """Log the running stats if STATS_LOG_INTERVAL_SECONDS have passed since the last time (monotonic now)."""
+        if now - self._stats_logged < STATS_LOG_INTERVAL_SECONDS:
+            return
+        self._stats_logged = now
+        logger.info(
+            "Rate limiter %s: %d waits (%.1f seconds waiting), %d successes, %d failures. "
+            "Operations in the last 24 hours: %d/%d",
+            self.name, self._stats["waits"], self._stats["wait_seconds"], self._stats["successes"],
+            self._stats["failures"], self.rate_limit_data['operations_count'], self.max_per_day
+        )
+    
+    def _is_night_time(self, now: Optional[datetime] = None) -> bool:
+        """Check if current time (or now, if given) is during night hours."""
+        current_time = (now or datetime.now()).time()
         # Night time is between 00:30 and 07:30
         return self.night_start <= current_time < self.morning_start
 
-    def _get_morning_resume_time(self) -> float:
-        """Calculate seconds to wait until morning resume time."""
-        now = datetime.now()
+    def _get_night_start_time(self, now: datetime) -> float:
+        """Calculate seconds from now until the next night starts."""
+        night_date = now.date() if now.time() < self.night_start else now.date() + timedelta(days=1)
+        return (datetime.combine(night_date, self.night_start) - now).total_seconds()
+
+    def _get_morning_resume_time(self, now: Optional[datetime] = None) -> float:
+        """Calculate seconds to wait until morning resume time, from now if given."""
+        now = now or datetime.now()
         current_date = now.date()
         
-        # If it's after midnight, use today's date, otherwise use tomorrow
-        if now.time() >= self.night_start:
-            resume_date = current_date.replace(day=current_date.day + 1)
-        else:
+        # If it's after midnight (before this morning's start), use today's date, otherwise use tomorrow
+        if now.time() < self.morning_start:
             resume_date = current_date
+        else:
+            resume_date = current_date + timedelta(days=1)
         
         # Random minutes between morning_start and morning_end
         random_minutes = random.randint(0, 30)  # 30 minutes window
-        resume_time = datetime.combine(resume_date, self.morning_start)
-        resume_time = resume_time.replace(minute=resume_time.minute + random_minutes)
+        resume_time = datetime.combine(resume_date, self.morning_start) + timedelta(minutes=random_minutes)
         
         return (resume_time - now).total_seconds()
 
@@ -124,58 +342,79 @@ class RateLimiter:
         
         Returns:
             bool: True if the operation should proceed, False if daily limit reached
+                or the limiter was cancelled
         
         Raises:
             Exception: If during night hours
         """
-        current_time = time.time()
-        
-        # Check night mode restrictions
-        if self.night_mode and self._is_night_time():
-            wait_time = self._get_morning_resume_time()
-            logger.info(
-                f"Night mode active for {self.name}. "
-                f"Pausing operations for {wait_time/3600:.1f} hours."
-            )
-            time.sleep(wait_time+10)
-            logger.info(f"Resuming operations for {self.name}")
-            # Reset daily counters as it's a new day
-            self.rate_limit_data = {
-                "date": str(date.today()),
-                "operations_count": 0,
-                "last_operation_time": None
-            }
-            self._save_rate_limit_data()
-            return self.wait()  # Recursive call to recheck conditions
+        if self._cancel.is_set():
+            return False
         
-        # Check if we've hit the daily limit
-        if self.rate_limit_data["operations_count"] >= self.max_per_day:
+        current_time = time.monotonic()
+        
+        # Check night mode restrictions. The wall clock is only read once the next night
+        # may have started, and then once for both checks.
+        if self.night_mode and current_time >= self._night_check_after:
+            now = datetime.now()
+            if self._is_night_time(now):
+                # Loop rather than trust a single sleep to land after the night
+                while self._is_night_time(now):
+                    wait_time = self._get_morning_resume_time(now)
+                    logger.info(
+                        "Night mode active for %s. Pausing operations for %.1f hours.",
+                        self.name, wait_time / 3600
+                    )
+                    if self._cancel.wait(max(0.0, wait_time)):
+                        return False
+                    now = datetime.now()
+                logger.info("Resuming operations for %s", self.name)
+            current_time = time.monotonic()
+            self._night_check_after = current_time + min(self._get_night_start_time(now), NIGHT_CHECK_MAX_SECONDS)
+        
+        # Check if we've hit the limit for the last 24 hours. Expiring old operations can
+        # only lower the count, so that's only worth doing once the limit looks reached.
+        operations_count = self.rate_limit_data["operations_count"]
+        if operations_count >= self.max_per_day:
+            with self._data_lock:
+                self._expire_operations()
+                operations_count = self.rate_limit_data["operations_count"]
+        if operations_count >= self.max_per_day:
             logger.warning(
-                f"Daily limit reached for {self.name}: "
-                f"{self.rate_limit_data['operations_count']}/{self.max_per_day} operations"
+                "Daily limit reached for %s: %d/%d operations",
+                self.name, operations_count, self.max_per_day
             )
             return False
         
         # Calculate delay with backoff if there were failures
         base_delay = max(self.min_delay, self.current_backoff)
         
-        if self.rate_limit_data["last_operation_time"] is not None:
-            time_since_last = current_time - self.rate_limit_data["last_operation_time"]
-            if time_since_last < base_delay:
-                wait_time = base_delay - time_since_last
+        # Concurrent callers are handed start slots at least base_delay apart, so they
+        # don't all compute the same wait from the same last operation and burst together
+        with self._slot_lock:
+            start = max(current_time, self._next_slot)
+            if self._last_op_mono is not None and start - self._last_op_mono < base_delay:
+                start = self._last_op_mono + base_delay
                 # Add jitter only if max_delay > current delay
                 if self.max_delay > base_delay:
-                    jitter = random.uniform(0, self.max_delay - base_delay)
-                    total_wait = wait_time + jitter
-                else:
-                    total_wait = wait_time
-                
-                logger.info(
-                    f"Rate limiting for {self.name}: waiting {total_wait:.1f} seconds. "
-                    f"Operations today: {self.rate_limit_data['operations_count']}/{self.max_per_day}"
-                )
-                time.sleep(total_wait)
-        
+                    start += random.uniform(0, self.max_delay - base_delay)
+            self._next_slot = start + base_delay
+        
+        total_wait = start - current_time
+        self._stats["waits"] += 1
+        if total_wait > 0:
+            self._stats["wait_seconds"] += total_wait
+            logger.debug(
+                "Rate limiting for %s: waiting %.1f seconds. Operations in the last 24 hours: %d/%d",
+                self.name, total_wait, self.rate_limit_data['operations_count'], self.max_per_day
+            )
+            # Sleep until the slot, leaving out waits too short to sleep accurately
+            remaining = total_wait
+            while remaining >= MIN_SLEEP_SECONDS:
+                if self._cancel.wait(remaining):
+                    return False
+                remaining = start - time.monotonic()
+        
+        self._maybe_log_stats(current_time)
         # Don't increment counters yet - wait for success confirmation
         return True
 
@@ -185,9 +424,21 @@ class RateLimiter:
         self.current_backoff = self.min_delay
         
         # Update rate limit data
-        self.rate_limit_data["last_operation_time"] = time.time()
-        self.rate_limit_data["operations_count"] += 1
-        self._save_rate_limit_data()
+        with self._data_lock:
+            self._stats["successes"] += 1
+            self._last_op_mono = time.monotonic()
+            now = time.time()
+            self.rate_limit_data["last_operation_time"] = now
+            self.rate_limit_data["operations_count"] += 1
+            minute = int(now // 60)
+            if self._buckets and self._buckets[-1][0] == minute:
+                self._buckets[-1][1] += 1
+            else:
+                self._buckets.append([minute, 1])
+            self._pending[minute] = self._pending.get(minute, 0) + 1
+            self._dirty = True
+            self._ops_since_flush += 1
+            self._maybe_flush()
 
     def record_failure(self):
         """Record a failed operation and increase backoff."""
@@ -199,19 +450,43 @@ class RateLimiter:
             self.max_backoff_seconds
         )
         
-        self.rate_limit_data["last_operation_time"] = time.time()
+        # Only the in-process clock: the persisted state changes with operations_count alone
+        self._last_op_mono = time.monotonic()
+        self._stats["failures"] += 1
         logger.warning(
-            f"Operation failed for {self.name}. "
-            f"Consecutive failures: {self.consecutive_failures}. "
-            f"Next backoff delay: {self.current_backoff:.1f} seconds"
+            "Operation failed for %s. Consecutive failures: %d. Next backoff delay: %.1f seconds",
+            self.name, self.consecutive_failures, self.current_backoff
         )
 
+def _parse_retry_after(value) -> Optional[float]:
+    """Seconds to wait from a retry-after header, given as seconds or an HTTP date."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 class ReactiveRateLimiter:
     """
     A specialized rate limiter for handling API rate limits reactively.
     Unlike the standard RateLimiter, this only introduces delays after encountering rate limit errors.
     It implements exponential backoff and tracks retry attempts.
     """
+    __slots__ = (
+        "name", "initial_backoff_seconds", "backoff_factor", "max_backoff_seconds",
+        "max_retries", "recovery_factor", "min_backoff_threshold", "recovery_alpha", "jitter",
+        "current_backoff", "_retry_count", "_has_had_failures", "_consecutive_successes",
+        "_backoff_from_server", "_cancel", "logger",
+    )
+    
     def __init__(self, 
                  name: str,
                  initial_backoff_seconds: float = 1.0,
@@ -219,7 +494,9 @@ class ReactiveRateLimiter:
                  max_backoff_seconds: float = 600.0,
                  max_retries: int = 10,
                  recovery_factor: float = 2.0,
-                 min_backoff_threshold: float = 0.01):
+                 min_backoff_threshold: float = 0.01,
+                 recovery_alpha: Optional[float] = None,
+                 jitter: bool = True):
         """
         Initialize a new ReactiveRateLimiter.
         
@@ -231,6 +508,10 @@ class ReactiveRateLimiter:
             max_retries: Maximum number of retry attempts before giving up
             recovery_factor: Factor by which to decrease backoff after successful calls
             min_backoff_threshold: Values below this are treated as zero
+            recovery_alpha: If set, subtract this many seconds from the backoff on each
+                success (AIMD) instead of dividing it by recovery_factor
+            jitter: Sleep a random time between half and all of the backoff, so workers
+                that failed together don't all retry at the same moment
         """
         self.name = name
         self.initial_backoff_seconds = initial_backoff_seconds
@@ -239,12 +520,19 @@ class ReactiveRateLimiter:
         self.max_retries = max_retries
         self.recovery_factor = recovery_factor
         self.min_backoff_threshold = min_backoff_threshold
+        self.recovery_alpha = recovery_alpha
+        self.jitter = jitter
         
         # Runtime state
         self.current_backoff = 0
         self._retry_count = 0
         self._has_had_failures = False
         self._consecutive_successes = 0
+        # Set when the backoff came from a retry-after header, which is never jittered below
+        self._backoff_from_server = False
+        
+        # Set by cancel() to wake every sleeping wait() caller
+        self._cancel = threading.Event()
         
         self.logger = logging.getLogger(__name__)
         
@@ -255,15 +543,24 @@ class ReactiveRateLimiter:
         
         Returns:
             bool: True if operation should proceed, False if it should be aborted
+                (the limiter was cancelled)
         """
+        if self._cancel.is_set():
+            return False
+        
         # Skip initial waiting if no failures yet
         if not self._has_had_failures:
             return True
         
-        # Apply the current backoff
+        # Apply the current backoff. Only the sleep is jittered: current_backoff keeps
+        # following the deterministic schedule.
         if self.current_backoff > 0:
-            self.logger.info(f"Rate limiting for {self.name}: waiting {self.current_backoff:.1f} seconds")
-            time.sleep(self.current_backoff)
+            delay = self.current_backoff
+            if self.jitter and not self._backoff_from_server:
+                delay = random.uniform(delay / 2, delay)
+            self.logger.info("Rate limiting for %s: waiting %.1f seconds", self.name, delay)
+            if self._cancel.wait(delay):
+                return False
         
         return True
         
@@ -273,11 +570,16 @@ class ReactiveRateLimiter:
         to allow recovery from rate limits over time.
         """
         self._consecutive_successes += 1
+        self._backoff_from_server = False
         
         # Only reduce backoff if we've had failures
         if self._has_had_failures and self.current_backoff > 0:
-            # Reduce backoff by the recovery factor, but don't go below zero
-            self.current_backoff = max(0, self.current_backoff / self.recovery_factor)
+            if self.recovery_alpha is not None:
+                # Additive decrease: linear recovery, reaches zero in a bounded number of calls
+                self.current_backoff = max(0, self.current_backoff - self.recovery_alpha)
+            else:
+                # Reduce backoff by the recovery factor, but don't go below zero
+                self.current_backoff = max(0, self.current_backoff / self.recovery_factor)
             
             # Treat very small values as zero
             if self.current_backoff < self.min_backoff_threshold:
@@ -285,17 +587,18 @@ class ReactiveRateLimiter:
             
             # Log the backoff reduction
             if self.current_backoff > 0:
-                self.logger.info(
-                    f"Successful call for {self.name}. "
-                    f"Reducing backoff delay to {self.current_backoff:.1f} seconds"
+                self.logger.debug(
+                    "Successful call for %s. Reducing backoff delay to %.1f seconds",
+                    self.name, self.current_backoff
                 )
             else:
-                self.logger.info(f"Backoff fully recovered for {self.name} after {self._consecutive_successes} successful calls")
-                
-                # If backoff is now zero, we can consider fully recovered
-                if self._consecutive_successes >= 3 and self.current_backoff == 0:
-                    self._has_had_failures = False
-                    self._retry_count = 0
+                self.logger.info("Backoff fully recovered for %s after %d successful calls", self.name, self._consecutive_successes)
+        
+        # Once the backoff is zero, 3 successes in a row count as fully recovered,
+        # even if the backoff reached zero before the third one
+        if self._has_had_failures and self.current_backoff == 0 and self._consecutive_successes >= 3:
+            self._has_had_failures = False
+            self._retry_count = 0
         
     def record_failure(self):
         """
@@ -304,6 +607,7 @@ class ReactiveRateLimiter:
         self._has_had_failures = True
         self._retry_count += 1
         self._consecutive_successes = 0  # Reset consecutive successes counter
+        self._backoff_from_server = False
         
         # Calculate new backoff with exponential increase
         if self.current_backoff == 0:
@@ -315,11 +619,51 @@ class ReactiveRateLimiter:
             )
             
         self.logger.warning(
-            f"Operation failed for {self.name}. "
-            f"Consecutive failures: {self._retry_count}. "
-            f"Next backoff delay: {self.current_backoff:.1f} seconds"
+            "Operation failed for %s. Consecutive failures: %d. Next backoff delay: %.1f seconds",
+            self.name, self._retry_count, self.current_backoff
         )
         
+    def record_response(self, headers) -> None:
+        """
+        Back off ahead of a rate limit using the headers of a response.
+        
+        A retry-after header sets the backoff directly (capped at max_backoff_seconds).
+        Otherwise, when a remaining/limit header pair shows less than
+        LOW_REMAINING_FRACTION of the quota left, the backoff is raised to at least
+        initial_backoff_seconds, before the provider starts rejecting calls.
+        
+        Args:
+            headers: Response headers, any mapping of header name to value
+        """
+        headers = {name.lower(): value for name, value in headers.items()}
+        
+        retry_after = _parse_retry_after(headers.get("retry-after"))
+        if retry_after is not None:
+            self.current_backoff = min(retry_after, self.max_backoff_seconds)
+            self._has_had_failures = True
+            self._backoff_from_server = True
+            self.logger.info("Provider asked %s to retry after %.1f seconds", self.name, self.current_backoff)
+            return
+        
+        for remaining_header, limit_header in RATE_LIMIT_HEADER_PAIRS:
+            try:
+                remaining = float(headers[remaining_header])
+                limit = float(headers[limit_header])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if limit > 0 and remaining / limit < LOW_REMAINING_FRACTION:
+                self.current_backoff = max(self.current_backoff, self.initial_backoff_seconds)
+                self._has_had_failures = True
+                self.logger.info(
+                    "%s has %d/%d left on %s, backing off %.1f seconds",
+                    self.name, remaining, limit, limit_header, self.current_backoff
+                )
+                return
+    
+    def cancel(self):
+        """Wake any thread sleeping in wait() and make this and later waits return False."""
+        self._cancel.set()
+    
     def exceeded_max_retries(self) -> bool:
         """
         Check if maximum retry attempts have been exceeded.